@@ -2,9 +2,31 @@ import pandas as pd
 import os
 from pathlib import Path
 
+from mesh_tool.gid_io import read_gid_columns, write_excel_sheets
+
+def read_gid_sheet(gid_file_path):
+    """
+    Read the sheet of one .gid file: sheet name and DataFrame (index, crank_angle, result).
+    """
+    # Get file info
+    gid_path = Path(gid_file_path)
+    gid_name = gid_path.stem  # filename without extension
+    folder_name = gid_path.parent.name  # parent folder name
+    
+    # Find the first data row from the header and parse the crank angle and
+    # result columns (whitespace-separated columns 1 and 2)
+    data = read_gid_columns(gid_file_path, columns=(1, 2))
+    result_df = pd.DataFrame(data, columns=['crank_angle', 'result'], copy=False)
+    
+    # Add index as folder name
+    result_df.insert(0, 'index', folder_name)
+    
+    return gid_name, result_df
+
+
 def gid_to_excel(gid_file_path, output_excel_path=None, delimiter=' ', sheet_merge=True):
     """
-    Extract data from .gid file (line 41 to end) and write to Excel.
+    Extract data from .gid file (first data row to end) and write to Excel.
     
     Parameters:
     -----------
@@ -23,32 +45,12 @@ def gid_to_excel(gid_file_path, output_excel_path=None, delimiter=' ', sheet_mer
         DataFrame with extracted columns (crank_angle, result)
     """
     
-    # Get file info
-    gid_path = Path(gid_file_path)
-    gid_name = gid_path.stem  # filename without extension
-    folder_name = gid_path.parent.name  # parent folder name
-    
     if output_excel_path is None:
         output_excel_path = 'output.xlsx'
     
     output_excel_path = Path(output_excel_path)
     
-    # Read .gid file starting from line 26 (0-indexed: line 25)
-    # Skip first 25 lines, then read
-    df = pd.read_csv(
-        gid_file_path,
-        delimiter=delimiter,
-        skiprows=25,  # Skip first 25 lines (0-24), start from line 26
-        header=None,
-        skipinitialspace=True
-    )
-    
-    # Extract columns 2 and 3 (0-indexed: columns 2 and 3)
-    result_df = df.iloc[:, [2, 3]].copy()
-    result_df.columns = ['crank_angle', 'result']
-    
-    # Add index as folder name
-    result_df.insert(0, 'index', folder_name)
+    gid_name, result_df = read_gid_sheet(gid_file_path)
     
     # Write to Excel
     if sheet_merge and output_excel_path.exists():
@@ -65,7 +67,8 @@ def gid_to_excel(gid_file_path, output_excel_path=None, delimiter=' ', sheet_mer
     return result_df
 
 
-def process_multiple_gid_files(directory_path, output_excel_path=None, delimiter=' ', pattern='*.gid'):
+def process_multiple_gid_files(directory_path, output_excel_path=None, delimiter=' ', pattern='*.gid',
+                               batched=True, write_only=False):
     """
     Process multiple .gid files from a directory and combine into one Excel file.
     
@@ -79,6 +82,14 @@ def process_multiple_gid_files(directory_path, output_excel_path=None, delimiter
         Delimiter in .gid files
     pattern : str, optional
         File pattern to search (default: '*.gid')
+    batched : bool, optional
+        If True, open the workbook once and write every sheet in that session;
+        if False, call gid_to_excel per file, which reloads and rewrites the
+        whole workbook for every sheet (default: True)
+    write_only : bool, optional
+        Stream rows through a write-only workbook with constant memory, for
+        sheets of hundreds of thousands of rows; the workbook is created from
+        scratch instead of appended to (default: False)
     """
     
     directory = Path(directory_path)
@@ -93,8 +104,16 @@ def process_multiple_gid_files(directory_path, output_excel_path=None, delimiter
     
     print(f"Found {len(gid_files)} .gid file(s). Processing...")
     
-    for gid_file in gid_files:
-        gid_to_excel(gid_file, output_excel_path, delimiter=delimiter, sheet_merge=True)
+    if not batched:
+        for gid_file in gid_files:
+            gid_to_excel(gid_file, output_excel_path, delimiter=delimiter, sheet_merge=True)
+        return
+    
+    # Files are parsed one at a time while the writer is open
+    sheets = (read_gid_sheet(gid_file) for gid_file in gid_files)
+    written = write_excel_sheets(output_excel_path, sheets, append=not write_only, write_only=write_only)
+    for sheet_name, rows in written:
+        print(f"✓ Written to {output_excel_path} | Sheet: {sheet_name} | Rows: {rows}")
 
 
 # Example usage:
@@ -107,4 +126,4 @@ if __name__ == "__main__":
     
     print("gid_to_excel module loaded. Use functions:")
     print("  - gid_to_excel(gid_file_path, output_excel, delimiter, sheet_merge)")
-    print("  - process_multiple_gid_files(directory, output_excel, delimiter, pattern)")
+    print("  - process_multiple_gid_files(directory, output_excel, delimiter, pattern, batched, write_only)")
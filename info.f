@@ -3,4 +3,10 @@ case_set: "KZZ"
 speed: [6000,7000]
 List_GID_file_name: ["BigEnd1-PTOT.GID","BigEnd1-PASP.GID"]
 excel_path: "C:/Results/Analysis_2024.xlsx"
-START_LINE: [26,27]
\ No newline at end of file
+workers: 8
+pool: "thread"
+cache_dir: "C:/Results/.gid_cache"
+cache_max_mb: 2048
+use_cache: True
+incremental: True
+# START_LINE: [26,27]  (optional override; the first data row is detected from the header)
\ No newline at end of file
@@ -0,0 +1,33 @@
+from mesh_tool.frame import (
+    CylindricalFrame,
+    cartesian_to_cylindrical,
+    cylindrical_to_cartesian,
+    get_frame,
+    multi_axis_to_cylindrical,
+    rotation_matrix,
+    stack_axes,
+)
+from mesh_tool.numbering import NodeIdCodec, assign_node_ids, layer_and_theta_index
+from mesh_tool.grouping import sort_into_layers
+from mesh_tool.connectivity import hex8_connectivity, structured_node_index
+from mesh_tool.node_table import NodeTable, node_dtype
+from mesh_tool.projection import (
+    cosine_distribution,
+    generate_perpendicular_points_batch,
+    geometric_distribution,
+    interpolate_to_axis,
+    linear_distribution,
+    perpendicular_direction,
+    project_onto_axis,
+)
+from mesh_tool.streaming import cylindrical_chunks, read_node_chunks, ring_chunks, stream_transform, write_node_chunks
+from mesh_tool.mesh_io import read_abaqus, read_nastran, write_abaqus, write_nastran
+from mesh_tool.cache import ArrayCache, MeshCache, hash_inputs
+from mesh_tool.pipeline import build_ring_mesh
+from mesh_tool.faces import FACE_NODES, find_faces_in_blocks, find_solid_faces, write_surface_element
+from mesh_tool.adjacency import FaceNeighbourIndex, NodeElementIndex
+from mesh_tool.merge import find_coincident_nodes, merge_coincident_nodes, remap_connectivity
+from mesh_tool.quality import element_quality, quality_summary, worst_elements
+from mesh_tool.renumbering import bandwidth, morton_order, node_graph, renumber_mesh, reverse_cuthill_mckee
+from mesh_tool.synthetic import crank_web_points, cylinder_points, layer_grid
+from mesh_tool.gid_io import find_data_start, gid_cache_key, read_gid_columns, replace_excel_sheets, write_excel_sheets
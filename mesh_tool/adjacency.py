@@ -0,0 +1,304 @@
+from pathlib import Path
+
+import numpy as np
+
+from mesh_tool.faces import CONFIG_BY_ELEMENT_TYPE, CONFIG_BY_NODE_COUNT, FACE_NODES
+
+
+def _blocks(elements, element_ids=None):
+    """
+    Normalize a connectivity array or ``{type: connectivity or (ids, connectivity)}``
+    to a list of (config, element_ids, connectivity) blocks.
+    """
+    if not isinstance(elements, dict):
+        connectivity = np.asarray(elements, dtype=np.int64)
+        elements = {CONFIG_BY_NODE_COUNT.get(connectivity.shape[1], 'solid'): (element_ids, connectivity)}
+    blocks = []
+    next_id = 1
+    for element_type, value in elements.items():
+        ids, connectivity = value if isinstance(value, tuple) else (None, value)
+        connectivity = np.asarray(connectivity, dtype=np.int64)
+        if ids is None:
+            ids = np.arange(next_id, next_id + len(connectivity), dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) != len(connectivity):
+            raise ValueError(f"got {len(ids)} element IDs for {len(connectivity)} {element_type} elements")
+        if len(ids):
+            next_id = int(ids.max()) + 1
+        config = CONFIG_BY_ELEMENT_TYPE.get(str(element_type).upper(), element_type)
+        if config not in FACE_NODES:
+            config = CONFIG_BY_NODE_COUNT.get(connectivity.shape[1])
+        blocks.append((config, ids, connectivity))
+    return blocks
+
+
+def _save_arrays(directory, prefix, arrays):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(directory / f'{prefix}-{name}.npy', array)
+
+
+def _load_arrays(directory, prefix, names, mmap_mode):
+    directory = Path(directory)
+    return [np.load(directory / f'{prefix}-{name}.npy', mmap_mode=mmap_mode) for name in names]
+
+
+class NodeElementIndex:
+    """
+    Node -> element index in compressed sparse row (CSR) form.
+
+    The elements around node ``node_ids[i]`` are
+    ``element_ids[positions[offsets[i]:offsets[i + 1]]]``, in ascending element
+    position and each element once, even if a degenerate element repeats the
+    node. Building the index is one sort of the connectivity; every query after
+    that is a binary search plus a slice instead of a scan of all elements.
+
+    Parameters:
+    -----------
+    node_ids : np.ndarray
+        (n_nodes,) sorted IDs of the nodes used by the elements
+    offsets : np.ndarray
+        (n_nodes + 1,) row offsets into ``positions``
+    positions : np.ndarray
+        Element positions, i.e. row numbers into ``element_ids``
+    element_ids : np.ndarray
+        (n_elem,) element IDs in connectivity order
+    """
+
+    FILES = ('node_ids', 'offsets', 'positions', 'element_ids')
+
+    def __init__(self, node_ids, offsets, positions, element_ids):
+        self.node_ids = node_ids
+        self.offsets = offsets
+        self.positions = positions
+        self.element_ids = element_ids
+
+    @classmethod
+    def build(cls, elements, element_ids=None):
+        """
+        Build the index from an (n_elem, k) connectivity array or from
+        ``{element_type: connectivity or (element_ids, connectivity)}`` blocks
+        as taken by ``write_abaqus``; blocks may mix hex8 and penta6 elements.
+        """
+        blocks = _blocks(elements, element_ids)
+        element_ids = np.concatenate([ids for _, ids, _ in blocks]) if blocks else np.empty(0, dtype=np.int64)
+        flat_nodes = []
+        flat_positions = []
+        start = 0
+        for _, ids, connectivity in blocks:
+            flat_nodes.append(connectivity.ravel())
+            flat_positions.append(np.repeat(np.arange(start, start + len(ids), dtype=np.int64), connectivity.shape[1]))
+            start += len(ids)
+        flat_nodes = np.concatenate(flat_nodes) if flat_nodes else np.empty(0, dtype=np.int64)
+        flat_positions = np.concatenate(flat_positions) if flat_positions else np.empty(0, dtype=np.int64)
+
+        node_ids, inverse = np.unique(flat_nodes, return_inverse=True)
+        # Stable sort keeps the element positions ascending within every node
+        order = np.argsort(inverse, kind='stable')
+        rows = inverse[order]
+        positions = flat_positions[order]
+        keep = np.ones(len(rows), dtype=bool)
+        keep[1:] = (rows[1:] != rows[:-1]) | (positions[1:] != positions[:-1])
+        rows = rows[keep]
+        positions = positions[keep]
+
+        offsets = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(node_ids)), out=offsets[1:])
+        return cls(node_ids, offsets, positions, element_ids)
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def __repr__(self):
+        return f"NodeElementIndex({len(self)} nodes, {len(self.element_ids)} elements)"
+
+    def _rows(self, node_ids):
+        """Row of each node ID in the index and a mask of the IDs that were found."""
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        rows = np.searchsorted(self.node_ids, node_ids)
+        found = rows < len(self.node_ids)
+        found[found] = self.node_ids[rows[found]] == node_ids[found]
+        return rows, found
+
+    def query(self, node_ids):
+        """
+        Batch query: the elements around each of ``node_ids``.
+
+        Returns:
+        --------
+        offsets : np.ndarray
+            (len(node_ids) + 1,) offsets into ``element_ids``; nodes that are not
+            in the mesh get an empty range
+        element_ids : np.ndarray
+            Concatenated element IDs of all queried nodes
+        """
+        rows, found = self._rows(node_ids)
+        starts = np.where(found, self.offsets[np.minimum(rows, len(self))], 0)
+        counts = np.where(found, self.offsets[np.minimum(rows + 1, len(self))] - starts, 0)
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        gather = np.repeat(starts - offsets[:-1], counts) + np.arange(offsets[-1], dtype=np.int64)
+        return offsets, self.element_ids[self.positions[gather]]
+
+    def elements_of(self, node_id):
+        """Element IDs around one node; empty if the node is not in the mesh."""
+        return self.query([node_id])[1]
+
+    def positions_touching(self, node_ids):
+        """Sorted unique positions of the elements that use any of ``node_ids``."""
+        rows, found = self._rows(node_ids)
+        rows = rows[found]
+        counts = self.offsets[rows + 1] - self.offsets[rows]
+        starts = np.repeat(self.offsets[rows] - np.cumsum(counts) + counts, counts)
+        gather = starts + np.arange(counts.sum(), dtype=np.int64)
+        return np.unique(self.positions[gather])
+
+    def elements_touching(self, node_ids):
+        """IDs of the elements that use any of ``node_ids``, each once, in connectivity order."""
+        return self.element_ids[self.positions_touching(node_ids)]
+
+    def save(self, directory):
+        """Write the index as ``node_elements-*.npy`` files, e.g. into a ``MeshCache`` entry."""
+        _save_arrays(directory, 'node_elements', dict(zip(self.FILES, (self.node_ids, self.offsets,
+                                                                       self.positions, self.element_ids))))
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Load an index written by ``save``; memory mapped read-only by default."""
+        return cls(*_load_arrays(directory, 'node_elements', cls.FILES, mmap_mode))
+
+
+class FaceNeighbourIndex:
+    """
+    Element -> element neighbour index across shared faces.
+
+    ``neighbours[e, f]`` is the position of the element sharing face ``f`` of
+    element position ``e`` and ``neighbour_faces[e, f]`` the index of that face
+    on the neighbour, both -1 on the boundary. Face indices are those of
+    ``FACE_NODES``; ``face_counts[e]`` is the number of faces of element ``e``,
+    the columns beyond it are padding. Faces are matched by their sorted node
+    IDs, so a triangle never matches a quadrilateral. A non-manifold face
+    shared by more than two elements is paired off two by two in element
+    position order, so the relation stays symmetric; with an odd count the
+    last of those elements gets -1 and its face is listed by
+    ``boundary_faces``.
+
+    Parameters:
+    -----------
+    neighbours, neighbour_faces : np.ndarray
+        (n_elem, max_faces) int64 neighbour positions and faces
+    face_counts : np.ndarray
+        (n_elem,) number of faces per element
+    element_ids : np.ndarray
+        (n_elem,) element IDs in connectivity order
+    """
+
+    FILES = ('neighbours', 'neighbour_faces', 'face_counts', 'element_ids')
+
+    def __init__(self, neighbours, neighbour_faces, face_counts, element_ids):
+        self.neighbours = neighbours
+        self.neighbour_faces = neighbour_faces
+        self.face_counts = face_counts
+        self.element_ids = element_ids
+        self._sorted_order = None
+        self._sorted_ids = None
+
+    @classmethod
+    def build(cls, elements, element_ids=None):
+        """Build the index from the same inputs as ``NodeElementIndex.build``."""
+        blocks = _blocks(elements, element_ids)
+        for config, _, connectivity in blocks:
+            if config not in FACE_NODES:
+                raise ValueError(f"cannot find faces of {connectivity.shape[1]}-node elements")
+        n_elem = sum(len(ids) for _, ids, _ in blocks)
+        max_faces = max((len(FACE_NODES[config]) for config, _, _ in blocks), default=0)
+        element_ids = np.concatenate([ids for _, ids, _ in blocks]) if blocks else np.empty(0, dtype=np.int64)
+        face_counts = np.empty(n_elem, dtype=np.int64)
+
+        keys = []
+        owners = []
+        start = 0
+        for config, ids, connectivity in blocks:
+            faces = FACE_NODES[config]
+            face_counts[start:start + len(ids)] = len(faces)
+            # (n, n_faces, 4) face nodes, triangles padded with -1, sorted per face
+            block_keys = np.full((len(ids), len(faces), 4), -1, dtype=np.int64)
+            for face_index, vertex_indices in enumerate(faces):
+                block_keys[:, face_index, :len(vertex_indices)] = connectivity[:, vertex_indices]
+            block_keys.sort(axis=-1)
+            keys.append(block_keys.reshape(-1, 4))
+            positions = np.arange(start, start + len(ids), dtype=np.int64)
+            owners.append(positions[:, None] * max_faces + np.arange(len(faces)))
+            start += len(ids)
+        keys = np.concatenate(keys) if keys else np.empty((0, 4), dtype=np.int64)
+        owners = np.concatenate([owner.ravel() for owner in owners]) if owners else np.empty(0, dtype=np.int64)
+
+        # Equal faces end up next to each other, in element position order
+        # (lexsort is stable). A run of more than two equal faces is a
+        # non-manifold face: it is paired off two by two from the start of the
+        # run, and the last face of an odd run is left without a neighbour
+        order = np.lexsort(keys.T[::-1])
+        keys = keys[order]
+        owners = owners[order]
+        same = np.all(keys[1:] == keys[:-1], axis=1)
+        run_starts = np.flatnonzero(np.concatenate(([True], ~same))[:len(keys)])
+        rank_in_run = np.arange(len(keys)) - np.repeat(run_starts, np.diff(np.append(run_starts, len(keys))))
+
+        neighbour_slots = np.full(n_elem * max_faces, -1, dtype=np.int64)
+        first = np.flatnonzero(same & (rank_in_run[:-1] % 2 == 0))
+        neighbour_slots[owners[first]] = owners[first + 1]
+        neighbour_slots[owners[first + 1]] = owners[first]
+
+        found = neighbour_slots >= 0
+        neighbours = np.where(found, neighbour_slots // max(max_faces, 1), -1).reshape(n_elem, max_faces)
+        neighbour_faces = np.where(found, neighbour_slots % max(max_faces, 1), -1).reshape(n_elem, max_faces)
+        return cls(neighbours, neighbour_faces, face_counts, element_ids)
+
+    def __len__(self):
+        return len(self.element_ids)
+
+    def __repr__(self):
+        return f"FaceNeighbourIndex({len(self)} elements)"
+
+    def index_of(self, element_ids):
+        """Positions of ``element_ids``; raises KeyError for unknown IDs."""
+        if self._sorted_order is None:
+            self._sorted_order = np.argsort(self.element_ids, kind='stable')
+            self._sorted_ids = self.element_ids[self._sorted_order]
+        element_ids = np.asarray(element_ids, dtype=np.int64)
+        sorted_ids = self._sorted_ids
+        positions = np.searchsorted(sorted_ids, element_ids)
+        positions = np.minimum(positions, max(len(sorted_ids) - 1, 0))
+        found = (sorted_ids[positions] == element_ids) if len(sorted_ids) else np.zeros(element_ids.shape, dtype=bool)
+        if not np.all(found):
+            missing = element_ids[~found] if element_ids.ndim else element_ids
+            raise KeyError(f"element IDs not in index: {np.ravel(missing)[:10].tolist()}")
+        return self._sorted_order[positions]
+
+    def neighbours_of(self, element_ids):
+        """
+        Batch query: the (len(element_ids), max_faces) neighbour element IDs per face,
+        -1 on the boundary and in padding columns.
+        """
+        positions = self.neighbours[self.index_of(np.asarray(element_ids).ravel())]
+        return np.where(positions >= 0, self.element_ids[np.maximum(positions, 0)], -1)
+
+    def boundary_faces(self):
+        """
+        Faces without a neighbour as ``(element_ids, face_indices)`` in element-then-face
+        order, ready for ``write_surface_element``.
+        """
+        real = np.arange(self.neighbours.shape[1]) < self.face_counts[:, None]
+        rows, face_indices = np.nonzero(real & (self.neighbours < 0))
+        return self.element_ids[rows], face_indices.astype(np.int64)
+
+    def save(self, directory):
+        """Write the index as ``face_neighbours-*.npy`` files, e.g. into a ``MeshCache`` entry."""
+        _save_arrays(directory, 'face_neighbours', dict(zip(self.FILES, (self.neighbours, self.neighbour_faces,
+                                                                         self.face_counts, self.element_ids))))
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Load an index written by ``save``; memory mapped read-only by default."""
+        return cls(*_load_arrays(directory, 'face_neighbours', cls.FILES, mmap_mode))
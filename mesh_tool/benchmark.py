@@ -0,0 +1,291 @@
+"""
+Benchmark harness of the node/element generation pipeline.
+
+Run as::
+
+    python -m mesh_tool.benchmark --sizes 1e3 1e4 1e5 1e6 --json results.json
+    python -m mesh_tool.benchmark --baseline results.json
+
+Every case generates synthetic points, then times the stages of the scripts
+one by one (``change_to_cylindrical``, ``group_and_sort_points``,
+``assign_ids_to_points``, element connectivity and output writing) and
+records wall time and peak traced memory (tracemalloc) per stage. With ``--baseline`` the
+results are compared against a stored run and the exit code is 1 on a
+regression.
+
+``--imports`` checks the cold import of the package and of the scripts
+instead: every module is imported in a fresh interpreter, must stay within
+``--import-budget`` seconds and must not load plotting or spreadsheet
+libraries.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from mesh_tool.connectivity import hex8_connectivity
+from mesh_tool.frame import get_frame
+from mesh_tool.grouping import sort_into_layers
+from mesh_tool.mesh_io import write_abaqus
+from mesh_tool.numbering import assign_node_ids
+from mesh_tool.synthetic import crank_web_points, cylinder_points, layer_grid
+
+GENERATORS = {'cylinder': cylinder_points, 'crank_web': crank_web_points}
+# (point1, point2) axis of every case, as passed to change_to_cylindrical
+CASE_AXES = {'cylinder': ((0.0, 0.0, 1.0), (0.0, 0.0, 0.0)), 'crank_web': ((0.3, 0.2, 1.0), (0.0, 0.0, 0.0))}
+DEFAULT_SIZES = (10**3, 10**4, 10**5, 10**6)
+DEFAULT_FRACTIONS = (0.9, 0.8, 0.7, 0.6, 0.5)
+# A stage is a regression when it is this much slower or larger than the baseline
+DEFAULT_THRESHOLD = 1.25
+# Modules checked by --imports, relative to the repository root
+IMPORT_MODULES = ('mesh_tool', 'Tool', 'Tool_____node__ele', 'plot', 'conver_coor_and_divide_base_func')
+# Libraries that must only load when a function that needs them is called
+HEAVY_MODULES = ('matplotlib', 'mpl_toolkits', 'pandas', 'openpyxl')
+DEFAULT_IMPORT_BUDGET = 0.5
+# Stages faster or smaller than this are too noisy to compare
+MIN_SECONDS = 0.01
+MIN_BYTES = 2**20
+
+
+class StageTimer:
+    """
+    Collect wall time and peak traced memory of named stages.
+
+    tracemalloc slows down code that allocates many Python objects (the text
+    writers most of all) by up to ten times, so a stage is timed in a plain run
+    and its memory peak is taken from a second, traced run.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+
+    def run(self, name, function, *args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        seconds = time.perf_counter() - start
+
+        peak = None
+        if self.trace_memory:
+            tracemalloc.start()
+            try:
+                function(*args, **kwargs)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        previous = self.stages.get(name)
+        # Keep the best of repeated runs
+        if previous is None or seconds < previous['seconds']:
+            self.stages[name] = {'seconds': seconds, 'peak_bytes': peak}
+        return result
+
+
+def run_case(case, n_nodes, fractions=DEFAULT_FRACTIONS, tolerance=0.1, repeat=1, trace_memory=True,
+             directory=None):
+    """
+    Run one synthetic case of about ``n_nodes`` output nodes through all stages.
+
+    Returns:
+    --------
+    dict
+        ``{'case', 'nodes', 'elements', 'stages': {stage: {'seconds', 'peak_bytes'}}}``
+    """
+    n_layers, n_theta = layer_grid(n_nodes / (len(fractions) + 1))
+    point1, point2 = (np.array(point) for point in CASE_AXES[case])
+    points = GENERATORS[case](n_layers, n_theta, point1=point1, point2=point2)
+    timer = StageTimer(trace_memory)
+
+    with tempfile.TemporaryDirectory(dir=directory) as scratch:
+        for _ in range(repeat):
+            frame = get_frame(point2, point1)
+            cylindrical = timer.run('change_to_cylindrical', frame.to_cylindrical, points)
+            order, layer_offsets = timer.run('group_and_sort_points', sort_into_layers, cylindrical, tolerance)
+            nodes = timer.run('assign_ids_to_points', assign_node_ids, cylindrical[order], layer_offsets,
+                              fractions, frame)
+            nz, ntheta = len(layer_offsets) - 1, int(np.diff(layer_offsets)[0])
+            connectivity = timer.run('connectivity', hex8_connectivity, nz, ntheta, len(fractions) + 1, nodes,
+                                     radii=(1.0,) + tuple(fractions))
+            timer.run('write_abaqus', write_abaqus, os.path.join(scratch, 'mesh.inp'), nodes,
+                      {'C3D8': connectivity})
+
+    return {'case': case, 'nodes': len(nodes), 'elements': len(connectivity), 'stages': timer.stages}
+
+
+def environment():
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run_benchmarks(cases=tuple(GENERATORS), sizes=DEFAULT_SIZES, **options):
+    """Run every case at every size and return the JSON-ready report."""
+    results = [run_case(case, int(size), **options) for case in cases for size in sizes]
+    return {'environment': environment(), 'results': results}
+
+
+_IMPORT_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'heavy': sorted(name for name in {heavy!r} if name in sys.modules)}}))
+'''
+
+
+def import_times(modules=IMPORT_MODULES, repeat=3, root=None):
+    """
+    Cold import time of every module, each measured in a fresh interpreter.
+
+    Returns:
+    --------
+    dict
+        ``{module: {'seconds': best of repeat, 'heavy': [heavy modules it loaded]}}``
+    """
+    root = Path(__file__).resolve().parents[1] if root is None else Path(root)
+    results = {}
+    for module in modules:
+        best = None
+        for _ in range(repeat):
+            probe = _IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)
+            output = subprocess.run([sys.executable, '-c', probe], cwd=root, capture_output=True, text=True,
+                                    check=True).stdout
+            # The module may print; the probe result is the last line
+            measured = json.loads(output.strip().splitlines()[-1])
+            if best is None or measured['seconds'] < best['seconds']:
+                best = measured
+        results[module] = best
+    return results
+
+
+def check_imports(results, budget=DEFAULT_IMPORT_BUDGET):
+    """Return a list of problems: modules over ``budget`` seconds or loading heavy libraries."""
+    problems = []
+    for module, measured in results.items():
+        if measured['seconds'] > budget:
+            problems.append(f"{module}: import took {measured['seconds']:.3f} s, budget {budget:.3f} s")
+        if measured['heavy']:
+            problems.append(f"{module}: import loaded {', '.join(measured['heavy'])}")
+    return problems
+
+
+def _result_key(result):
+    return result['case'], result['nodes']
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD, min_seconds=MIN_SECONDS, min_bytes=MIN_BYTES):
+    """
+    Compare a report against a baseline report.
+
+    Returns:
+    --------
+    list of dict
+        One row per stage present in both, with ``time_ratio``, ``memory_ratio``
+        and ``regression`` set when either ratio exceeds ``threshold``; stages
+        below ``min_seconds`` or ``min_bytes`` in both runs are not flagged
+    """
+    reference = {_result_key(result): result for result in baseline['results']}
+    rows = []
+    for result in report['results']:
+        base = reference.get(_result_key(result))
+        if base is None:
+            continue
+        for stage, values in result['stages'].items():
+            old = base['stages'].get(stage)
+            if old is None:
+                continue
+            time_ratio = values['seconds'] / old['seconds'] if old['seconds'] > 0 else None
+            memory_ratio = None
+            if values.get('peak_bytes') and old.get('peak_bytes'):
+                memory_ratio = values['peak_bytes'] / old['peak_bytes']
+            slower = (time_ratio is not None and time_ratio > threshold
+                      and max(values['seconds'], old['seconds']) >= min_seconds)
+            larger = (memory_ratio is not None and memory_ratio > threshold
+                      and max(values['peak_bytes'], old['peak_bytes']) >= min_bytes)
+            rows.append({'case': result['case'], 'nodes': result['nodes'], 'stage': stage,
+                         'seconds': values['seconds'], 'baseline_seconds': old['seconds'],
+                         'time_ratio': time_ratio, 'memory_ratio': memory_ratio,
+                         'regression': bool(slower or larger)})
+    return rows
+
+
+def format_report(report):
+    lines = [f"{'case':<10} {'nodes':>10} {'stage':<22} {'seconds':>9} {'peak MB':>9}"]
+    for result in report['results']:
+        for stage, values in result['stages'].items():
+            peak = values['peak_bytes']
+            peak = f"{peak / 2**20:9.1f}" if peak is not None else f"{'-':>9}"
+            lines.append(f"{result['case']:<10} {result['nodes']:>10} {stage:<22} {values['seconds']:9.4f} {peak}")
+    return '\n'.join(lines)
+
+
+def format_comparison(rows):
+    lines = [f"{'case':<10} {'nodes':>10} {'stage':<22} {'time x':>7} {'mem x':>7}"]
+    for row in rows:
+        time_ratio = f"{row['time_ratio']:7.2f}" if row['time_ratio'] is not None else f"{'-':>7}"
+        memory_ratio = f"{row['memory_ratio']:7.2f}" if row['memory_ratio'] is not None else f"{'-':>7}"
+        flag = '  REGRESSION' if row['regression'] else ''
+        lines.append(f"{row['case']:<10} {row['nodes']:>10} {row['stage']:<22} {time_ratio} {memory_ratio}{flag}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mesh_tool.benchmark', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cases', nargs='+', choices=sorted(GENERATORS), default=list(GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=float, default=list(DEFAULT_SIZES),
+                        help='approximate output node counts, e.g. 1e3 1e7')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per case, the best one is kept')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (lower overhead)')
+    parser.add_argument('--json', help='write the report to this file')
+    parser.add_argument('--baseline', help='compare against this report')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='time or memory ratio above which a stage counts as a regression')
+    parser.add_argument('--imports', action='store_true', help='check cold import times instead')
+    parser.add_argument('--import-budget', type=float, default=DEFAULT_IMPORT_BUDGET,
+                        help='maximum cold import time per module in seconds')
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        results = import_times()
+        for module, measured in results.items():
+            print(f"{module:<36} {measured['seconds']:7.3f} s")
+        problems = check_imports(results, args.import_budget)
+        for problem in problems:
+            print(problem)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump({'environment': environment(), 'imports': results}, f, indent=2)
+        return 1 if problems else 0
+
+    report = run_benchmarks(args.cases, args.sizes, repeat=args.repeat, trace_memory=not args.no_memory)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        print()
+        print(format_comparison(rows))
+        if any(row['regression'] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from mesh_tool.node_table import NodeTable
+
+# Bump when the stored layout or the mesh generation changes, so old entries miss
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def hash_inputs(*arrays, **options):
+    """
+    Content hash of the mesh inputs.
+
+    Arrays are hashed by dtype, shape and raw bytes; options by their JSON form
+    with sorted keys. The result is a hex SHA-256 digest used as cache key.
+    """
+    digest = hashlib.sha256(f"mesh_tool-cache-v{CACHE_VERSION}".encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(memoryview(array).cast('B'))
+    digest.update(json.dumps(options, sort_keys=True, default=repr).encode())
+    return digest.hexdigest()
+
+
+def _write_entry(entry, arrays):
+    """
+    Save ``{file_name: array}`` into a temporary directory and rename it to
+    ``entry``, so a concurrent reader never sees a partial entry.
+    """
+    staging = Path(tempfile.mkdtemp(prefix=f".{entry.name}-", dir=entry.parent))
+    try:
+        for file_name, array in arrays.items():
+            np.save(staging / file_name, array)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(staging, entry)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+class MeshCache:
+    """
+    Content-addressed on-disk cache of generated meshes.
+
+    Every entry is a directory named after its key holding raw ``.npy`` files:
+    ``nodes.npy`` (the NodeTable records) and one ``elements-<TYPE>.npy`` per
+    element type. Entries are loaded with ``mmap_mode='r'``, so a hit costs no
+    copy and no parse. The total size is capped at ``max_bytes``; when a store
+    goes over it, the least recently used entries are deleted.
+
+    Parameters:
+    -----------
+    directory : str or Path
+        Cache directory, created if missing
+    max_bytes : int, optional
+        Size cap of all entries together (default: 2 GiB)
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self.directory)!r}, max_bytes={self.max_bytes})"
+
+    def _entry(self, key):
+        return self.directory / key
+
+    def path(self, key):
+        """Directory of the entry ``key``; extra files such as adjacency indexes can be saved next to the mesh."""
+        return self._entry(key)
+
+    def __contains__(self, key):
+        return (self._entry(key) / 'nodes.npy').exists()
+
+    def load(self, key):
+        """
+        Return ``(nodes, elements)`` for ``key`` as read-only memory maps, or None on a miss.
+
+        ``elements`` is ``{element_type: connectivity}``. A hit marks the entry
+        as most recently used; an entry that another process evicts while it
+        is being loaded is a miss.
+        """
+        entry = self._entry(key)
+        try:
+            nodes = NodeTable(np.load(entry / 'nodes.npy', mmap_mode='r'))
+            elements = {path.stem.split('-', 1)[1]: np.load(path, mmap_mode='r')
+                        for path in sorted(entry.glob('elements-*.npy'))}
+            # Another process may evict the entry between the loads and here
+            os.utime(entry)
+        except (FileNotFoundError, ValueError):
+            return None
+        return nodes, elements
+
+    def store(self, key, nodes, elements):
+        """
+        Store a mesh under ``key`` and evict old entries if the cap is exceeded.
+
+        The entry is written to a temporary directory and renamed into place,
+        so a concurrent reader never sees a partial entry.
+        """
+        arrays = {'nodes.npy': nodes.data}
+        for element_type, connectivity in elements.items():
+            arrays[f'elements-{element_type}.npy'] = np.asarray(connectivity)
+        _write_entry(self._entry(key), arrays)
+        self.evict(keep=key)
+
+    def entries(self):
+        """Return ``[(key, size_in_bytes, last_used), ...]`` sorted from least to most recently used."""
+        result = []
+        for entry in self.directory.iterdir():
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            try:
+                size = sum(path.stat().st_size for path in entry.iterdir())
+                result.append((entry.name, size, entry.stat().st_mtime))
+            except FileNotFoundError:
+                # Evicted or replaced by another process while listing
+                continue
+        return sorted(result, key=lambda item: item[2])
+
+    def size(self):
+        """Total size of all entries in bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Delete every entry."""
+        for key, _, _ in self.entries():
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def get_or_build(self, key, build):
+        """Return the cached mesh for ``key``, or call ``build()`` -> (nodes, elements) and store it."""
+        cached = self.load(key)
+        if cached is not None:
+            return cached
+        nodes, elements = build()
+        self.store(key, nodes, elements)
+        return nodes, elements
+
+
+class ArrayCache:
+    """
+    On-disk cache of single arrays, e.g. parsed result columns.
+
+    Same directory layout, memory-mapped loads and LRU size cap as
+    ``MeshCache``, but every entry holds one ``array.npy``. The directory
+    bookkeeping (listing, eviction, clearing) is delegated to a wrapped
+    ``MeshCache``; ``store`` and ``get_or_build`` take and return a single
+    array, so ``ArrayCache`` is not a ``MeshCache`` subclass.
+
+    Parameters:
+    -----------
+    directory : str or Path
+        Cache directory, created if missing
+    max_bytes : int, optional
+        Size cap of all entries together (default: 2 GiB)
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self._entries = MeshCache(directory, max_bytes)
+
+    @property
+    def directory(self):
+        return self._entries.directory
+
+    @property
+    def max_bytes(self):
+        return self._entries.max_bytes
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self.directory)!r}, max_bytes={self.max_bytes})"
+
+    def path(self, key):
+        """Directory of the entry ``key``."""
+        return self._entries.path(key)
+
+    def __contains__(self, key):
+        return (self.path(key) / 'array.npy').exists()
+
+    def load(self, key):
+        """Return the array for ``key`` as a read-only memory map, or None on a miss."""
+        entry = self.path(key)
+        try:
+            array = np.load(entry / 'array.npy', mmap_mode='r')
+            os.utime(entry)
+        except (FileNotFoundError, ValueError):
+            return None
+        return array
+
+    def store(self, key, array):
+        """Store ``array`` under ``key`` and evict old entries if the cap is exceeded."""
+        _write_entry(self.path(key), {'array.npy': np.asarray(array)})
+        self.evict(keep=key)
+
+    def entries(self):
+        """Return ``[(key, size_in_bytes, last_used), ...]`` sorted from least to most recently used."""
+        return self._entries.entries()
+
+    def size(self):
+        """Total size of all entries in bytes."""
+        return self._entries.size()
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        self._entries.evict(keep=keep)
+
+    def clear(self):
+        """Delete every entry."""
+        self._entries.clear()
+
+    def get_or_build(self, key, build):
+        """Return the cached array for ``key``, or call ``build()`` -> array and store it."""
+        cached = self.load(key)
+        if cached is not None:
+            return cached
+        array = build()
+        self.store(key, array)
+        return array
@@ -0,0 +1,75 @@
+import numpy as np
+
+from mesh_tool.node_table import NodeTable
+
+
+def structured_node_index(nz, ntheta, nr):
+    """Return the (nz, ntheta, nr) array of flat node positions of a structured ring grid."""
+    return np.arange(nz * ntheta * nr, dtype=np.int64).reshape(nz, ntheta, nr)
+
+
+def hex8_connectivity(nz, ntheta, nr, node_ids=None, closed=True, radii=None):
+    """
+    Hex8 connectivity of a structured (layer, theta, radial) grid.
+
+    Nodes are expected layer by layer, theta by theta inside a layer and ring
+    by ring inside a theta position, which is the order ``assign_node_ids``
+    produces. Element (k, j, i) spans layers k..k+1, theta positions j..j+1
+    and rings i..i+1; nodes 0-3 lie on layer k and nodes 4-7 on layer k+1,
+    both faces in the order (j, i), (j, i+1), (j+1, i+1), (j+1, i).
+
+    That order gives positive volumes when the radius grows with the ring
+    index. Where ``radii`` says ring i+1 lies inside ring i, e.g. fraction
+    rings below 1, nodes 1 and 3 (and 5 and 7) are swapped so those elements
+    are not inverted.
+
+    Parameters:
+    -----------
+    nz, ntheta, nr : int
+        Number of layers, theta positions per layer and rings per theta position
+    node_ids : array_like or NodeTable, optional
+        (nz * ntheta * nr,) node IDs or the node table holding them; if None,
+        0-based node positions are returned
+    closed : bool, optional
+        If True the last theta position connects back to the first (default: True)
+    radii : array_like, optional
+        (nr,) radius or radius scale of every ring, e.g. ``[1] + fractions``
+        for ``assign_node_ids`` nodes; if None, rings are taken as growing outward
+
+    Returns:
+    --------
+    np.ndarray
+        (n_elem, 8) int64 connectivity, elements ordered by layer, theta and ring
+    """
+    nz, ntheta, nr = int(nz), int(ntheta), int(nr)
+    if nz < 2 or nr < 2 or ntheta < (3 if closed else 2):
+        return np.empty((0, 8), dtype=np.int64)
+
+    index = structured_node_index(nz, ntheta, nr)
+    j = np.arange(ntheta if closed else ntheta - 1)
+    jn = (j + 1) % ntheta
+
+    def face(layer):
+        return (layer[:, j, :-1], layer[:, j, 1:], layer[:, jn, 1:], layer[:, jn, :-1])
+
+    bottom = face(index[:-1])
+    top = face(index[1:])
+    connectivity = np.stack(bottom + top, axis=-1)
+
+    if radii is not None:
+        radii = np.asarray(radii, dtype=float)
+        if radii.shape != (nr,):
+            raise ValueError(f"expected {nr} ring radii, got shape {radii.shape}")
+        inward = radii[1:] < radii[:-1]
+        connectivity[:, :, inward] = connectivity[:, :, inward][..., [0, 3, 2, 1, 4, 7, 6, 5]]
+    connectivity = connectivity.reshape(-1, 8)
+
+    if node_ids is not None:
+        if isinstance(node_ids, NodeTable):
+            node_ids = node_ids.ids
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        if len(node_ids) != index.size:
+            raise ValueError(f"expected {index.size} node IDs for a {nz}x{ntheta}x{nr} grid, got {len(node_ids)}")
+        connectivity = node_ids[connectivity]
+
+    return connectivity
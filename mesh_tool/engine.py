@@ -0,0 +1,131 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# 256k points per block: 6 MB of float64 coordinates, small enough to stay
+# cache-friendly and large enough that the per-block overhead is negligible
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+
+def _as_points(points):
+    points = np.asarray(points)
+    if not np.issubdtype(points.dtype, np.floating):
+        points = points.astype(np.float64)
+    if points.shape[-1:] != (3,):
+        raise ValueError(f"points must have shape (..., 3), got {points.shape}")
+    return points
+
+
+def _resolve_out(shape, out, dtype):
+    if out is None:
+        return np.empty(shape, dtype=np.float64 if dtype is None else dtype)
+    if out.shape != shape:
+        raise ValueError(f"out must have shape {shape}, got {out.shape}")
+    if dtype is not None and np.dtype(dtype) != out.dtype:
+        raise ValueError(f"out has dtype {out.dtype}, but dtype={np.dtype(dtype)} was requested")
+    if out.dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+        raise ValueError(f"out must be float32 or float64, got {out.dtype}")
+    return out
+
+
+def run_chunked(kernel, points, out, chunk_size=None, workers=None):
+    """
+    Apply ``kernel(points_block, out_block)`` over fixed-size row blocks.
+
+    Blocks are processed on a thread pool of ``workers`` threads (default: the
+    CPU count); NumPy releases the GIL inside the kernels, so the blocks run in
+    parallel. Every kernel writes straight into its slice of ``out``, so peak
+    memory is ``out`` plus a few block-sized temporaries per worker.
+    """
+    chunk_size = DEFAULT_CHUNK_SIZE if chunk_size is None else int(chunk_size)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    n = len(points)
+    starts = range(0, n, chunk_size)
+
+    def work(start):
+        stop = min(start + chunk_size, n)
+        kernel(points[start:stop], out[start:stop])
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or n <= chunk_size:
+        for start in starts:
+            work(start)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # list() re-raises the first exception of any block
+            list(pool.map(work, starts))
+    return out
+
+
+def _transform(kernel_factory, points, out, dtype, chunk_size, workers):
+    points = _as_points(points)
+    shape = points.shape
+    flat_points = points.reshape(-1, 3)
+    out = _resolve_out(shape, out, dtype)
+    flat_out = out.reshape(-1, 3)
+    if out.size and not np.may_share_memory(flat_out, out):
+        raise ValueError("out must be reshapeable to (n, 3) without a copy")
+    # Compute in the wider of the input and output precision, cast when storing
+    compute_dtype = np.result_type(points.dtype, out.dtype)
+    run_chunked(kernel_factory(compute_dtype), flat_points, flat_out, chunk_size, workers)
+    return out
+
+
+def to_local(points, origin, R, out=None, dtype=None, chunk_size=None, workers=None):
+    """Chunked ``(points - origin) @ R.T`` into ``out``."""
+    def factory(compute_dtype):
+        origin_c = np.asarray(origin, dtype=compute_dtype)
+        R_T = np.asarray(R, dtype=compute_dtype).T
+
+        def kernel(block, out_block):
+            out_block[...] = np.dot(block - origin_c, R_T)
+        return kernel
+    return _transform(factory, points, out, dtype, chunk_size, workers)
+
+
+def to_global(local_points, origin, R, out=None, dtype=None, chunk_size=None, workers=None):
+    """Chunked ``local_points @ R + origin`` into ``out``."""
+    def factory(compute_dtype):
+        origin_c = np.asarray(origin, dtype=compute_dtype)
+        R_c = np.asarray(R, dtype=compute_dtype)
+
+        def kernel(block, out_block):
+            out_block[...] = np.dot(block, R_c) + origin_c
+        return kernel
+    return _transform(factory, local_points, out, dtype, chunk_size, workers)
+
+
+def to_cylindrical(points, origin, R, out=None, dtype=None, chunk_size=None, workers=None):
+    """Chunked global Cartesian -> (theta, r, z) about the axis (origin, R) into ``out``."""
+    def factory(compute_dtype):
+        origin_c = np.asarray(origin, dtype=compute_dtype)
+        R_T = np.asarray(R, dtype=compute_dtype).T
+
+        def kernel(block, out_block):
+            local = np.dot(block - origin_c, R_T)
+            x, y = local[:, 0], local[:, 1]
+            out_block[:, 0] = np.arctan2(y, x)
+            out_block[:, 1] = np.sqrt(x**2 + y**2)
+            out_block[:, 2] = local[:, 2]
+        return kernel
+    return _transform(factory, points, out, dtype, chunk_size, workers)
+
+
+def from_cylindrical(cylindrical_points, origin, R, out=None, dtype=None, chunk_size=None, workers=None):
+    """Chunked (theta, r, z) about the axis (origin, R) -> global Cartesian into ``out``."""
+    def factory(compute_dtype):
+        origin_c = np.asarray(origin, dtype=compute_dtype)
+        R_c = np.asarray(R, dtype=compute_dtype)
+
+        def kernel(block, out_block):
+            theta, r = block[:, 0], block[:, 1]
+            local = np.empty(block.shape, dtype=compute_dtype)
+            local[:, 0] = r * np.cos(theta)
+            local[:, 1] = r * np.sin(theta)
+            local[:, 2] = block[:, 2]
+            out_block[...] = np.dot(local, R_c) + origin_c
+        return kernel
+    return _transform(factory, cylindrical_points, out, dtype, chunk_size, workers)
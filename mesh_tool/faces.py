@@ -0,0 +1,120 @@
+import numpy as np
+
+from mesh_tool.mesh_io import write_blocks
+
+# Face node tables of get_faceid in from_Ken_kun.tcl; the position in the list is the face index
+FACE_NODES = {
+    'hex8': [[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [0, 4, 7, 3]],
+    'penta6': [[0, 1, 2], [3, 4, 5], [0, 1, 4, 3], [1, 2, 5, 4], [0, 3, 5, 2]],
+    'tetra4': [[0, 1, 2], [0, 1, 3], [1, 2, 3], [0, 3, 2]],
+}
+CONFIG_BY_NODE_COUNT = {8: 'hex8', 6: 'penta6', 4: 'tetra4'}
+CONFIG_BY_ELEMENT_TYPE = {'C3D8': 'hex8', 'C3D6': 'penta6', 'C3D4': 'tetra4',
+                          'CHEXA': 'hex8', 'CPENTA': 'penta6', 'CTETRA': 'tetra4'}
+
+
+def _face_selected(face, member, n_selected):
+    """
+    Vectorized ``check_intersection``: the number of distinct face nodes in the
+    selection must equal the smaller of the face size and the selection size.
+    """
+    k = face.shape[1]
+    # A node counts once even if a degenerate face repeats it, like lsort -unique
+    repeated = np.zeros(face.shape, dtype=bool)
+    for j in range(1, k):
+        repeated[:, j] = np.any(face[:, :j] == face[:, j:j + 1], axis=1)
+    common = np.count_nonzero(member & ~repeated, axis=1)
+    return common == min(k, n_selected)
+
+
+def find_solid_faces(connectivity, face_nodes, element_ids=None, config=None, index=None):
+    """
+    Python equivalent of ``get_faceid`` over a whole connectivity array.
+
+    Parameters:
+    -----------
+    connectivity : array_like
+        (n_elem, k) solid elements, k = 8 (hex8), 6 (penta6) or 4 (tetra4)
+    face_nodes : array_like
+        Selected face node IDs
+    element_ids : array_like, optional
+        (n_elem,) element IDs; defaults to 1..n_elem
+    config : str, optional
+        'hex8', 'penta6' or 'tetra4'; inferred from k if omitted
+    index : NodeElementIndex, optional
+        Node -> element index of ``connectivity``; if given, only the elements
+        around the selected nodes are looked at instead of all elements
+
+    Returns:
+    --------
+    element_ids : np.ndarray
+        IDs of the elements with a selected face, once per face
+    face_indices : np.ndarray
+        Face index of each pair in the numbering of from_Ken_kun.tcl
+    """
+    connectivity = np.asarray(connectivity, dtype=np.int64)
+    if config is None:
+        config = CONFIG_BY_NODE_COUNT.get(connectivity.shape[1])
+    if config not in FACE_NODES:
+        raise ValueError(f"cannot find faces of {connectivity.shape[1]}-node elements")
+    if element_ids is None:
+        element_ids = np.arange(1, len(connectivity) + 1, dtype=np.int64)
+    element_ids = np.asarray(element_ids, dtype=np.int64)
+
+    face_nodes = np.unique(np.asarray(face_nodes, dtype=np.int64))
+    if len(face_nodes) < 3:
+        # sel_solidface needs at least three face nodes
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    # Only elements touching the selection can have a selected face
+    if index is not None:
+        candidates = index.positions_touching(face_nodes)
+        connectivity = connectivity[candidates]
+        member = np.isin(connectivity, face_nodes)
+    else:
+        member = np.isin(connectivity, face_nodes)
+        candidates = np.flatnonzero(member.any(axis=1))
+        connectivity = connectivity[candidates]
+        member = member[candidates]
+
+    faces = FACE_NODES[config]
+    selected = np.zeros((len(candidates), len(faces)), dtype=bool)
+    for face_index, vertex_indices in enumerate(faces):
+        selected[:, face_index] = _face_selected(connectivity[:, vertex_indices], member[:, vertex_indices],
+                                                 len(face_nodes))
+
+    # Row-major nonzero keeps the element-then-face order of the Tcl loops
+    rows, face_indices = np.nonzero(selected)
+    return element_ids[candidates[rows]], face_indices.astype(np.int64)
+
+
+def find_faces_in_blocks(elements, face_nodes):
+    """
+    ``find_solid_faces`` over ``{element_type: (element_ids, connectivity)}`` blocks
+    as returned by ``read_abaqus``; the result is sorted by element ID.
+    """
+    found_ids = []
+    found_faces = []
+    for element_type, (element_ids, connectivity) in elements.items():
+        config = CONFIG_BY_ELEMENT_TYPE.get(str(element_type).upper(), element_type)
+        if config not in FACE_NODES:
+            continue
+        ids, faces = find_solid_faces(connectivity, face_nodes, element_ids, config)
+        found_ids.append(ids)
+        found_faces.append(faces)
+    if not found_ids:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    ids = np.concatenate(found_ids)
+    faces = np.concatenate(found_faces)
+    order = np.argsort(ids, kind='stable')
+    return ids[order], faces[order]
+
+
+def write_surface_element(f, name, element_ids, face_indices):
+    """
+    Write an Abaqus ``*SURFACE, TYPE=ELEMENT`` segment set to the open file ``f``.
+
+    The Tcl face indices of hex8, penta6 and tetra4 map onto the Abaqus face
+    labels as S1 = face 0, S2 = face 1, and so on.
+    """
+    f.write(f'*SURFACE, TYPE=ELEMENT, NAME={name}\n')
+    write_blocks(f, '%d, S%d\n', [np.asarray(element_ids), np.asarray(face_indices) + 1])
@@ -0,0 +1,178 @@
+import functools
+
+import numpy as np
+
+from mesh_tool import engine
+
+
+def _rotation_matrix(ax, ay, az):
+    axis_vector = np.array([ax, ay, az], dtype=float)
+    axis_vector = axis_vector / np.linalg.norm(axis_vector)
+    z_axis = np.array([0, 0, 1])
+    rotation_axis = np.cross(axis_vector, z_axis)
+    rotation_angle = np.arccos(np.dot(axis_vector, z_axis))
+
+    if np.linalg.norm(rotation_axis) != 0:
+        rotation_axis = rotation_axis / np.linalg.norm(rotation_axis)
+        ux, uy, uz = rotation_axis
+        c = np.cos(rotation_angle)
+        s = np.sin(rotation_angle)
+        R = np.array([
+            [c + ux**2 * (1 - c),     ux * uy * (1 - c) - uz * s, ux * uz * (1 - c) + uy * s],
+            [uy * ux * (1 - c) + uz * s, c + uy**2 * (1 - c),     uy * uz * (1 - c) - ux * s],
+            [uz * ux * (1 - c) - uy * s, uz * uy * (1 - c) + ux * s, c + uz**2 * (1 - c)]
+        ])
+    elif np.dot(axis_vector, z_axis) < 0:
+        # Anti-parallel axis: turn 180 degrees about x so that -z maps onto +z
+        R = np.diag([1.0, -1.0, -1.0])
+    else:
+        R = np.eye(3)
+
+    R.setflags(write=False)
+    return R
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_rotation_matrix(ax, ay, az):
+    return _rotation_matrix(ax, ay, az)
+
+
+def rotation_matrix(axis_vector):
+    """
+    Return the 3x3 matrix R that rotates ``axis_vector`` onto the z axis.
+
+    The matrix is cached per axis direction and returned read-only, so repeated
+    calls with the same axis do not rebuild it.
+    """
+    ax, ay, az = (float(a) for a in np.asarray(axis_vector, dtype=float).ravel())
+    return _cached_rotation_matrix(ax, ay, az)
+
+
+def cartesian_to_cylindrical(points):
+    x, y, z = points[..., 0], points[..., 1], points[..., 2]
+    r = np.sqrt(x**2 + y**2)
+    theta = np.arctan2(y, x)
+    return np.stack((theta, r, z), axis=-1)
+
+
+def cylindrical_to_cartesian(cylindrical_points):
+    theta, r, z = cylindrical_points[..., 0], cylindrical_points[..., 1], cylindrical_points[..., 2]
+    x = r * np.cos(theta)
+    y = r * np.sin(theta)
+    return np.stack((x, y, z), axis=-1)
+
+
+class CylindricalFrame:
+    """
+    Cylindrical coordinate frame with its origin at ``origin`` and its z axis
+    pointing from ``origin`` towards ``axis_point``.
+
+    The rotation matrix ``R`` and its transpose ``R_T`` are built once, so the
+    frame can be reused for every transform of a run. All transforms accept
+    arrays of shape (..., 3) and return arrays of the same shape. They run on
+    the chunked engine in ``mesh_tool.engine`` and take its ``out``, ``dtype``,
+    ``chunk_size`` and ``workers`` keyword options.
+
+    Parameters:
+    -----------
+    origin : array_like
+        Point on the axis used as the origin of the frame
+    axis_point : array_like
+        Second point on the axis; the local z axis points towards it
+    """
+
+    def __init__(self, origin, axis_point):
+        self.origin = np.array(origin, dtype=float)
+        self.axis_point = np.array(axis_point, dtype=float)
+        self.axis_vector = self.axis_point - self.origin
+        self.R = rotation_matrix(self.axis_vector)
+        self.R_T = self.R.T
+
+    def __repr__(self):
+        return f"CylindricalFrame(origin={self.origin.tolist()}, axis_point={self.axis_point.tolist()})"
+
+    def to_local(self, points, **options):
+        """Translate and rotate global Cartesian points into the frame."""
+        return engine.to_local(points, self.origin, self.R, **options)
+
+    def to_global(self, local_points, **options):
+        """Inverse of ``to_local``: rotate back and translate to global Cartesian."""
+        return engine.to_global(local_points, self.origin, self.R, **options)
+
+    def to_cylindrical(self, points, **options):
+        """Global Cartesian points -> (theta, r, z) in the frame."""
+        return engine.to_cylindrical(points, self.origin, self.R, **options)
+
+    def from_cylindrical(self, cylindrical_points, **options):
+        """(theta, r, z) in the frame -> global Cartesian points."""
+        return engine.from_cylindrical(cylindrical_points, self.origin, self.R, **options)
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_frame(origin, axis_point):
+    return CylindricalFrame(origin, axis_point)
+
+
+def get_frame(origin, axis_point):
+    """
+    Return a cached ``CylindricalFrame`` for the axis ``origin`` -> ``axis_point``.
+
+    Frames are keyed by the axis coordinates, so functions that are called once
+    per point with the same axis share a single frame.
+    """
+    origin = tuple(float(a) for a in np.asarray(origin, dtype=float).ravel())
+    axis_point = tuple(float(a) for a in np.asarray(axis_point, dtype=float).ravel())
+    return _cached_frame(origin, axis_point)
+
+
+def stack_axes(axes):
+    """
+    Origins and rotation matrices of K axes given as a (K, 2, 3) array.
+
+    Axis ``k`` runs from ``axes[k, 0]`` (the origin) towards ``axes[k, 1]``, as
+    in ``CylindricalFrame``. Returns (K, 3) origins and (K, 3, 3) matrices.
+    """
+    axes = np.asarray(axes, dtype=float)
+    if axes.ndim != 3 or axes.shape[1:] != (2, 3):
+        raise ValueError(f"axes must have shape (K, 2, 3), got {axes.shape}")
+    origins = axes[:, 0]
+    rotations = np.stack([rotation_matrix(axis_vector) for axis_vector in axes[:, 1] - axes[:, 0]])
+    return origins, rotations
+
+
+def multi_axis_to_cylindrical(axes, points, labels=None):
+    """
+    Cylindrical coordinates of one point cloud about many axes at once.
+
+    Parameters:
+    -----------
+    axes : array_like
+        (K, 2, 3) axes, each given by its origin and a second point on it
+    points : array_like
+        (n, 3) global Cartesian points
+    labels : array_like, optional
+        (n,) axis index of every point. If given, every point is transformed
+        about its own axis only and the result has shape (n, 3)
+
+    Returns:
+    --------
+    np.ndarray
+        (K, n, 3) (theta, r, z) of every point about every axis, or (n, 3)
+        when ``labels`` is given
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    origins, rotations = stack_axes(axes)
+
+    if labels is None:
+        # local_k = R_k (p - o_k) = R_k p - R_k o_k, without K translated copies of the cloud
+        local = np.einsum('kij,nj->kni', rotations, points)
+        local -= np.einsum('kij,kj->ki', rotations, origins)[:, None, :]
+        return cartesian_to_cylindrical(local)
+
+    labels = np.asarray(labels, dtype=np.intp).ravel()
+    if len(labels) != len(points):
+        raise ValueError(f"got {len(labels)} labels for {len(points)} points")
+    if labels.size and (labels.min() < 0 or labels.max() >= len(origins)):
+        raise ValueError(f"labels must be in [0, {len(origins) - 1}]")
+    local = np.einsum('nij,nj->ni', rotations[labels], points - origins[labels])
+    return cartesian_to_cylindrical(local)
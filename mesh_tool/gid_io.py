@@ -0,0 +1,310 @@
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+import numpy as np
+
+from mesh_tool.cache import hash_inputs
+
+# GID headers are written by Fortran tools and may hold non-UTF-8 unit symbols
+GID_ENCODING = 'latin-1'
+GID_COMMENT = '!'
+
+
+def _numeric_fields(line):
+    """Number of fields of an all-numeric line: 0 for a text line, None for a blank or comment line."""
+    fields = line.split(GID_COMMENT, 1)[0].split()
+    if not fields:
+        return None
+    try:
+        for field in fields:
+            float(field)
+    except ValueError:
+        return 0
+    return len(fields)
+
+
+def find_data_start(gid_file_path):
+    """
+    Locate the first data row of a GID file.
+
+    A data row is a line of at least two numeric fields whose next non-blank
+    line has the same number of numeric fields (or that ends the file), so
+    numbers inside the header are not mistaken for data.
+
+    Returns:
+    --------
+    start_line : int or None
+        1-indexed line of the first data row, None if the file has no data
+    n_columns : int
+        Number of fields of the data rows (0 if there are none)
+    """
+    with open(gid_file_path, 'r', encoding=GID_ENCODING) as f:
+        start_line, n_columns = _scan_header(f)
+    return start_line, n_columns
+
+
+def _scan_header(f):
+    """Like ``find_data_start`` on an open file; leaves ``f`` at the first data row."""
+    candidate = None
+    line_number = 0
+    while True:
+        offset = f.tell()
+        line = f.readline()
+        if not line:
+            break
+        line_number += 1
+        n = _numeric_fields(line)
+        if n is None:
+            continue
+        if candidate is not None:
+            if n == candidate[2]:
+                break
+            candidate = None
+        if n >= 2:
+            candidate = (line_number, offset, n)
+    if candidate is None:
+        return None, 0
+    f.seek(candidate[1])
+    return candidate[0], candidate[2]
+
+
+def _peek_fields(f):
+    """Number of fields of the next non-blank line of ``f`` (0 at the end); ``f`` does not move."""
+    offset = f.tell()
+    n = 0
+    for line in iter(f.readline, ''):
+        fields = line.split(GID_COMMENT, 1)[0].split()
+        if fields:
+            n = len(fields)
+            break
+    f.seek(offset)
+    return n
+
+
+def _read_tolerant(f, columns):
+    """Slow path: keep only the lines that hold numbers in all requested columns."""
+    rows = []
+    needed = max(columns) + 1
+    for line in f:
+        fields = line.split(GID_COMMENT, 1)[0].split()
+        if len(fields) < needed:
+            continue
+        try:
+            rows.append([float(fields[column]) for column in columns])
+        except ValueError:
+            continue
+    return np.array(rows, dtype=np.float64).reshape(-1, len(columns))
+
+
+def gid_cache_key(gid_file_path, **options):
+    """
+    Cache key of a parsed GID file: its absolute path, size and modification
+    time plus the parse ``options``, so any change of the file is a miss.
+    """
+    stat = os.stat(gid_file_path)
+    return hash_inputs(kind='gid_columns', path=os.path.abspath(gid_file_path), size=stat.st_size,
+                       mtime_ns=stat.st_mtime_ns, **options)
+
+
+def read_gid_columns(gid_file_path, columns=(1, 2), start_line=None, drop_missing=False, cache=None):
+    """
+    Read numeric columns of a GID result file.
+
+    The header is scanned once for the first data row (see
+    ``find_data_start``), then only the requested columns are parsed by
+    NumPy's C reader. Files with malformed rows, e.g. a text footer, fall back
+    to a line-by-line parse that skips the bad rows.
+
+    Parameters:
+    -----------
+    gid_file_path : str or Path
+        Path to the .gid file
+    columns : sequence of int, optional
+        0-indexed whitespace-separated columns to read (default: (1, 2), the
+        crank angle and the result)
+    start_line : int, optional
+        1-indexed first data line; detected from the header if None
+    drop_missing : bool, optional
+        If True, columns the file does not have are left out; if False they
+        raise ValueError (default: False)
+    cache : ArrayCache, optional
+        Cache of parsed columns keyed by ``gid_cache_key``; a hit is a
+        read-only memory map and skips the parse. None bypasses the cache
+
+    Returns:
+    --------
+    np.ndarray
+        (n_rows, n_columns) float64 array
+    """
+    columns = [int(column) for column in columns]
+    if not columns or min(columns) < 0:
+        raise ValueError(f"columns must be non-negative column indices, got {columns}")
+    if cache is not None:
+        key = gid_cache_key(gid_file_path, columns=columns, start_line=start_line, drop_missing=drop_missing)
+        return cache.get_or_build(key, lambda: read_gid_columns(gid_file_path, columns, start_line, drop_missing))
+
+    with open(gid_file_path, 'r', encoding=GID_ENCODING) as f:
+        if start_line is None:
+            start_line, n_columns = _scan_header(f)
+            if start_line is None:
+                return np.empty((0, len(columns)), dtype=np.float64)
+        else:
+            for _ in range(max(0, int(start_line) - 1)):
+                f.readline()
+            n_columns = _peek_fields(f)
+        # Check the columns against the first data row here, so that the
+        # fallback below only ever deals with malformed rows further down
+        if drop_missing:
+            columns = [column for column in columns if column < n_columns]
+            if not columns:
+                return np.empty((0, 0), dtype=np.float64)
+        elif max(columns) >= n_columns:
+            raise ValueError(f"{gid_file_path} has {n_columns} columns from line {start_line}, "
+                             f"requested column {max(columns)}")
+        offset = f.tell()
+        try:
+            return np.loadtxt(f, dtype=np.float64, comments=GID_COMMENT, usecols=columns, ndmin=2)
+        except ValueError:
+            f.seek(offset)
+            return _read_tolerant(f, columns)
+
+
+def _sheet_items(sheets):
+    return sheets.items() if isinstance(sheets, dict) else sheets
+
+
+def write_excel_sheets(output_excel_path, sheets, append=True, write_only=False, header=True):
+    """
+    Write many DataFrames to one workbook in a single writer session.
+
+    The workbook is opened and saved once, however many sheets are written,
+    instead of being reloaded and rewritten for every sheet. ``sheets`` may
+    be a generator, so every file can be parsed just before its sheet is
+    written and only one sheet is held in memory.
+
+    Parameters:
+    -----------
+    output_excel_path : str or Path
+        Output Excel file path
+    sheets : dict or iterable of (str, pd.DataFrame)
+        Sheet name and data of every sheet
+    append : bool, optional
+        If True and the file exists, keep its other sheets and replace the
+        sheets of the same name; if False, create/overwrite (default: True)
+    write_only : bool, optional
+        Stream the rows through an openpyxl write-only workbook: memory stays
+        constant for sheets of hundreds of thousands of rows. It cannot edit
+        an existing workbook, so it needs ``append=False`` or a new file
+        (default: False)
+    header : bool, optional
+        Write the column names as first row (default: True)
+
+    Returns:
+    --------
+    list of (str, int)
+        Name and number of data rows of every written sheet
+    """
+    output_excel_path = Path(output_excel_path)
+    append = append and output_excel_path.exists()
+    written = []
+    if write_only:
+        if append:
+            raise ValueError(f"write_only cannot append to the existing workbook {output_excel_path}")
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        for sheet_name, df in _sheet_items(sheets):
+            worksheet = workbook.create_sheet(sheet_name)
+            if header:
+                worksheet.append([str(column) for column in df.columns])
+            for row in df.itertuples(index=False, name=None):
+                worksheet.append(row)
+            written.append((sheet_name, len(df)))
+        workbook.save(output_excel_path)
+        return written
+
+    import pandas as pd
+
+    options = {'mode': 'a', 'if_sheet_exists': 'replace'} if append else {}
+    with pd.ExcelWriter(output_excel_path, engine='openpyxl', **options) as writer:
+        for sheet_name, df in _sheet_items(sheets):
+            df.to_excel(writer, sheet_name=sheet_name, index=False, header=header)
+            written.append((sheet_name, len(df)))
+    return written
+
+
+_XLSX_NS = {
+    'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+}
+
+
+def _sheet_parts(archive):
+    """``{sheet_name: worksheet part name}`` of an open .xlsx archive."""
+    workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    relations = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {}
+    for relation in relations.findall('rel:Relationship', _XLSX_NS):
+        target = relation.get('Target')
+        targets[relation.get('Id')] = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+    return {sheet.get('name'): targets[sheet.get(f"{{{_XLSX_NS['r']}}}id")]
+            for sheet in workbook.find('main:sheets', _XLSX_NS)}
+
+
+def _self_contained(archive, part):
+    """True if a worksheet part has no relationships (drawings, links) and no cell styles."""
+    folder, name = part.rsplit('/', 1)
+    if f"{folder}/_rels/{name}.rels" in archive.namelist():
+        return False
+    return b' s="' not in archive.read(part)
+
+
+def replace_excel_sheets(output_excel_path, sheets, header=True):
+    """
+    Replace existing sheets of a workbook without rewriting the others.
+
+    The new sheets are written to a scratch workbook, then their worksheet
+    parts are swapped into the .xlsx archive of ``output_excel_path``; the
+    other parts are copied as they are, without being loaded into openpyxl.
+    When that is not possible (a sheet is new, or a sheet has styles, charts
+    or links that live outside its own part) the sheets are written through
+    ``write_excel_sheets`` in append mode instead.
+
+    Parameters:
+    -----------
+    output_excel_path : str or Path
+        Existing Excel file
+    sheets : dict or iterable of (str, pd.DataFrame)
+        Sheet name and data of every sheet to replace
+    header : bool, optional
+        Write the column names as first row (default: True)
+
+    Returns:
+    --------
+    list of (str, int)
+        Name and number of data rows of every written sheet
+    """
+    output_excel_path = Path(output_excel_path)
+    sheets = list(_sheet_items(sheets))
+    with tempfile.TemporaryDirectory(dir=output_excel_path.parent) as scratch:
+        scratch_path = Path(scratch) / 'sheets.xlsx'
+        written = write_excel_sheets(scratch_path, sheets, append=False, header=header)
+        with zipfile.ZipFile(output_excel_path) as target, zipfile.ZipFile(scratch_path) as source:
+            target_parts = _sheet_parts(target)
+            source_parts = _sheet_parts(source)
+            spliceable = all(name in target_parts and _self_contained(target, target_parts[name])
+                             and _self_contained(source, source_parts[name]) for name, _ in written)
+            if spliceable:
+                replacements = {target_parts[name]: source.read(source_parts[name]) for name, _ in written}
+                staging = Path(scratch) / 'workbook.xlsx'
+                with zipfile.ZipFile(staging, 'w') as out:
+                    for info in target.infolist():
+                        out.writestr(info, replacements.get(info.filename) or target.read(info.filename))
+        if not spliceable:
+            return write_excel_sheets(output_excel_path, sheets, append=True, header=header)
+        os.replace(staging, output_excel_path)
+    return written
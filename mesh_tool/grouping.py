@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def sort_into_layers(cylindrical_points, tolerance=0.1):
+    """
+    Sort-and-sweep replacement for ``group_and_sort_points``.
+
+    The points are sorted by z once. A layer starts at the lowest remaining z
+    and takes every point up to ``tolerance`` above it; each layer boundary is
+    found with a binary search. Inside a layer the points are sorted by theta.
+
+    This deliberately differs from the original ``group_and_sort_points``,
+    which anchored each layer at the first remaining point in input order
+    and took everything within ``tolerance`` on both sides of it. The result
+    now does not depend on the input order. Both rules give the same layers
+    when every layer is at most ``tolerance`` thick and the gap between
+    layers is larger than ``tolerance``, as with the scripts' meshes. They can
+    differ otherwise: z = [0.08, 0.0, 0.16] with tolerance 0.1 is one layer
+    under the old rule and two layers here.
+
+    Parameters:
+    -----------
+    cylindrical_points : array_like
+        (n, 3) points as (theta, r, z)
+    tolerance : float, optional
+        Maximum z distance from the lowest point of a layer (default: 0.1)
+
+    Returns:
+    --------
+    order : np.ndarray
+        (n,) int64 indices into ``cylindrical_points``, layer by layer and
+        by theta inside a layer
+    layer_offsets : np.ndarray
+        (layers + 1,) int64 start offset of every layer in ``order``
+    """
+    cylindrical_points = np.asarray(cylindrical_points, dtype=float)
+    n = len(cylindrical_points)
+    z_order = np.argsort(cylindrical_points[:, 2], kind='stable')
+    z_sorted = cylindrical_points[z_order, 2]
+
+    offsets = [0]
+    while offsets[-1] < n:
+        start = offsets[-1]
+        end = np.searchsorted(z_sorted, z_sorted[start] + tolerance, side='right')
+        offsets.append(max(int(end), start + 1))
+    layer_offsets = np.array(offsets, dtype=np.int64)
+
+    # Layer-major, theta-minor order in one lexsort
+    layer_of_sorted = np.repeat(np.arange(len(layer_offsets) - 1), np.diff(layer_offsets))
+    theta_sorted = cylindrical_points[z_order, 0]
+    order = z_order[np.lexsort((theta_sorted, layer_of_sorted))]
+
+    return order.astype(np.int64), layer_offsets
@@ -0,0 +1,169 @@
+import numpy as np
+
+from mesh_tool.node_table import NodeTable
+
+# Half of the 26 neighbour cells plus the cell itself: every pair of cells is visited once
+_HALF_NEIGHBOURS = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                    if (dx, dy, dz) >= (0, 0, 0)]
+# Odd 64-bit multiplier of the row hash
+_HASH_FACTOR = np.uint64(0x9E3779B97F4A7C15).astype(np.int64)
+# Candidate pairs compared per batch
+PAIR_BLOCK = 1 << 22
+
+
+def _mix(values, seed=0):
+    """Hash the rows of an (n, 3) int64 array into one int64 per row; wraps around by design."""
+    factor = _HASH_FACTOR + 2 * seed
+    return (values[:, 0] * factor + values[:, 1]) * factor + values[:, 2]
+
+
+def _hashed_cells(cells):
+    """
+    Sort the points by a hash of their cell. Returns the hash seed, the sort
+    order and the hash, first position and size of every occupied cell.
+    """
+    for seed in range(16):
+        keys = _mix(cells, seed)
+        order = np.argsort(keys, kind='stable')
+        cell_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+        sorted_cells = cells[order]
+        # Two different cells with the same hash: try the next seed
+        if np.array_equal(sorted_cells, sorted_cells[np.repeat(starts, counts)]):
+            return seed, order, cell_keys, starts, counts
+    raise RuntimeError("could not find a collision-free cell hash")
+
+
+def _cell_pairs(order, starts, counts, a, b):
+    """Point positions of all pairs between cells ``a`` and cells ``b``."""
+    sizes = counts[a] * counts[b]
+    total = int(sizes.sum())
+    local = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    cb = np.repeat(counts[b], sizes)
+    i = order[np.repeat(starts[a], sizes) + local // cb]
+    j = order[np.repeat(starts[b], sizes) + local % cb]
+    return i, j
+
+
+def _close_pairs(coordinates, tolerance):
+    """All pairs (i, j), i != j, of points at most ``tolerance`` apart."""
+    cells = np.floor(coordinates / tolerance).astype(np.int64)
+    seed, order, cell_keys, starts, counts = _hashed_cells(cells)
+    occupied = cells[order[starts]]
+
+    pairs_i = [np.empty(0, dtype=np.int64)]
+    pairs_j = [np.empty(0, dtype=np.int64)]
+    for dx, dy, dz in _HALF_NEIGHBOURS:
+        neighbour_keys = _mix(occupied + (dx, dy, dz), seed)
+        slots = np.searchsorted(cell_keys, neighbour_keys).clip(0, len(cell_keys) - 1)
+        a = np.flatnonzero(cell_keys[slots] == neighbour_keys)
+        b = slots[a]
+        if (dx, dy, dz) == (0, 0, 0):
+            # Inside a cell only cells holding more than one point can pair up
+            a = b = a[counts[a] > 1]
+        # Every point of cell a against every point of cell b, in batches of
+        # about PAIR_BLOCK pairs so that crowded cells cannot exhaust memory
+        sizes = counts[a] * counts[b]
+        bounds = np.searchsorted(np.cumsum(sizes), np.arange(PAIR_BLOCK, int(sizes.sum()), PAIR_BLOCK))
+        for batch in np.split(np.arange(len(a)), np.unique(bounds + 1)):
+            i, j = _cell_pairs(order, starts, counts, a[batch], b[batch])
+            delta = coordinates[i] - coordinates[j]
+            close = (np.einsum('ij,ij->i', delta, delta) <= tolerance * tolerance) & (i != j)
+            pairs_i.append(i[close])
+            pairs_j.append(j[close])
+    return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+
+def find_coincident_nodes(coordinates, tolerance=0.1):
+    """
+    Group points that lie within ``tolerance`` of each other.
+
+    The points are hashed into cubic cells of edge ``tolerance``, so two
+    coincident points are always in the same or in neighbouring cells and only
+    those are compared. Groups are closed transitively: if a is close to b and
+    b to c, all three end up in one group.
+
+    Parameters:
+    -----------
+    coordinates : array_like
+        (n, 3) point coordinates
+    tolerance : float, optional
+        Merge distance (default: 0.1)
+
+    Returns:
+    --------
+    np.ndarray
+        (n,) int64 position of the point that represents each point's group,
+        the lowest position in the group
+    """
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 3)
+    if not tolerance > 0:
+        raise ValueError(f"tolerance must be positive, got {tolerance}")
+    if len(coordinates) < 2:
+        return np.arange(len(coordinates), dtype=np.int64)
+    # Exact duplicates, e.g. all nodes of a ring scaled to the axis, are merged
+    # up front through a hash of the coordinate bits so that they do not crowd
+    # a single cell; a hash collision only leaves the work to the cell search
+    bits = np.ascontiguousarray(coordinates + 0.0).view(np.int64)
+    digest = _mix(bits)
+    _, first, inverse = np.unique(digest, return_index=True, return_inverse=True)
+    representative = first[inverse.ravel()]
+    positions = np.arange(len(coordinates), dtype=np.int64)
+    representative = np.where(np.all(coordinates[representative] == coordinates, axis=1), representative, positions)
+    kept = np.flatnonzero(representative == positions)
+    i, j = _close_pairs(coordinates[kept], tolerance)
+    i, j = kept[i], kept[j]
+
+    # Label propagation with pointer jumping; converges in a few passes
+    while len(i):
+        lowest = np.minimum(representative[i], representative[j])
+        before = representative.copy()
+        np.minimum.at(representative, i, lowest)
+        np.minimum.at(representative, j, lowest)
+        representative = representative[representative]
+        if np.array_equal(before, representative):
+            break
+    return representative
+
+
+def remap_connectivity(elements, nodes, remap):
+    """
+    Replace node IDs in ``elements`` in place by ``remap[nodes.index_of(id)]``.
+
+    ``elements`` is a connectivity array or ``{type: connectivity or (ids, connectivity)}``.
+    """
+    if isinstance(elements, dict):
+        for value in elements.values():
+            remap_connectivity(value[1] if isinstance(value, tuple) else value, nodes, remap)
+        return elements
+    elements[...] = remap[nodes.index_of(elements)]
+    return elements
+
+
+def merge_coincident_nodes(nodes, elements=None, tolerance=0.1):
+    """
+    Merge nodes closer than ``tolerance`` and renumber the elements.
+
+    Of every group of coincident nodes the first one in the table is kept.
+
+    Parameters:
+    -----------
+    nodes : NodeTable
+        Nodes to merge
+    elements : array_like or dict, optional
+        Connectivity array or ``{type: connectivity or (ids, connectivity)}`` of
+        node IDs; the duplicate IDs are replaced in place by the kept IDs
+    tolerance : float, optional
+        Merge distance, like ``tolerance`` of ``group_and_sort_points`` (default: 0.1)
+
+    Returns:
+    --------
+    merged : NodeTable
+        The kept nodes in their original order
+    remap : np.ndarray
+        (len(nodes),) ID of the kept node for every input node
+    """
+    representative = find_coincident_nodes(nodes.coordinates, tolerance)
+    remap = nodes.ids[representative]
+    if elements is not None:
+        remap_connectivity(elements, nodes, remap)
+    return NodeTable(nodes.data[representative == np.arange(len(nodes))]), remap
@@ -0,0 +1,243 @@
+import itertools
+import re
+
+import numpy as np
+
+from mesh_tool.node_table import NodeTable
+
+# Rows formatted per buffer; one buffer is one string and one write call
+WRITE_BLOCK = 100000
+
+ABAQUS_TO_NASTRAN = {'C3D8': 'CHEXA', 'C3D6': 'CPENTA', 'C3D4': 'CTETRA'}
+NASTRAN_TO_ABAQUS = {value: key for key, value in ABAQUS_TO_NASTRAN.items()}
+NODES_PER_ELEMENT = {'C3D8': 8, 'C3D6': 6, 'C3D4': 4}
+# Nastran integer fields hold at most 8 digits
+NASTRAN_MAX_ID = 10**8 - 1
+
+
+def format_rows(row_format, columns):
+    """
+    Format equally long columns into one string with a single ``%`` operation.
+
+    ``row_format`` is the printf-style format of one row including its newline;
+    repeating it ``n`` times and applying it to the flattened values is far
+    faster than formatting and writing row by row.
+    """
+    columns = [np.asarray(column).tolist() for column in columns]
+    if not columns or not columns[0]:
+        return ''
+    values = tuple(itertools.chain.from_iterable(zip(*columns)))
+    return (row_format * len(columns[0])) % values
+
+
+def write_blocks(f, row_format, columns, block=WRITE_BLOCK):
+    """Write ``columns`` to the open file ``f`` in buffers of ``block`` rows."""
+    n = len(columns[0])
+    for start in range(0, n, block):
+        f.write(format_rows(row_format, [column[start:start + block] for column in columns]))
+
+
+def _element_blocks(elements):
+    """Normalize ``{type: connectivity or (ids, connectivity)}`` to (type, ids, connectivity) triples."""
+    next_id = 1
+    blocks = []
+    for element_type, value in elements.items():
+        if isinstance(value, tuple):
+            element_ids, connectivity = value
+        else:
+            element_ids, connectivity = None, value
+        connectivity = np.asarray(connectivity, dtype=np.int64)
+        expected = NODES_PER_ELEMENT.get(element_type.upper())
+        if expected is not None and connectivity.shape[1:] != (expected,):
+            raise ValueError(f"{element_type} needs {expected} nodes per element, got shape {connectivity.shape}")
+        if element_ids is None:
+            element_ids = np.arange(next_id, next_id + len(connectivity), dtype=np.int64)
+        element_ids = np.asarray(element_ids, dtype=np.int64)
+        if len(element_ids) != len(connectivity):
+            raise ValueError(f"got {len(element_ids)} element IDs for {len(connectivity)} {element_type} elements")
+        if len(element_ids):
+            next_id = int(element_ids.max()) + 1
+        blocks.append((element_type.upper(), element_ids, connectivity))
+    return blocks
+
+
+def write_abaqus(path, nodes, elements, elset=None, precision=10):
+    """
+    Write an Abaqus input fragment with one *NODE block and one *ELEMENT block per type.
+
+    Parameters:
+    -----------
+    path : str or Path
+        Output .inp file
+    nodes : NodeTable
+        Nodes to write
+    elements : dict
+        ``{element_type: connectivity}`` or ``{element_type: (element_ids, connectivity)}``,
+        e.g. ``{'C3D8': hex_connectivity, 'C3D6': penta_connectivity}``. Element IDs
+        default to consecutive numbers continuing across the blocks
+    elset : str, optional
+        ELSET name given to every *ELEMENT block
+    precision : int, optional
+        Significant digits of the coordinates (default: 10)
+    """
+    node_format = f'%d, %.{precision}g, %.{precision}g, %.{precision}g\n'
+    with open(path, 'w') as f:
+        f.write('*NODE\n')
+        write_blocks(f, node_format, [nodes.ids, nodes.x, nodes.y, nodes.z])
+        for element_type, element_ids, connectivity in _element_blocks(elements):
+            header = f'*ELEMENT, TYPE={element_type}'
+            if elset:
+                header += f', ELSET={elset}'
+            f.write(header + '\n')
+            element_format = ', '.join(['%d'] * (connectivity.shape[1] + 1)) + '\n'
+            write_blocks(f, element_format, [element_ids, *connectivity.T])
+
+
+def _check_nastran_ids(kind, ids):
+    ids = np.asarray(ids)
+    if ids.size and (ids.min() < 1 or ids.max() > NASTRAN_MAX_ID):
+        raise ValueError(f"Nastran {kind} IDs must be in [1, {NASTRAN_MAX_ID}], got {ids.min()}..{ids.max()}; "
+                         f"10GGTTTFF node IDs do not fit, renumber the mesh first with "
+                         f"renumber_mesh(nodes, elements, renumber_ids=True)")
+
+
+def write_nastran(path, nodes, elements, pid=1, precision=10):
+    """
+    Write GRID* and CHEXA/CPENTA/CTETRA bulk data cards in free-field format.
+
+    Nodes go on large-field GRID* cards (with a ``*`` continuation for the z
+    coordinate), so coordinates keep up to 16 characters instead of 8.
+    Coordinates always carry a decimal point, since Nastran takes a field
+    without one as an integer.
+    Nastran IDs are limited to 8 digits: node and element IDs must be below
+    100000000, which excludes the 10GGTTTFF IDs, and a ValueError points to
+    ``renumber_mesh``. ``elements`` takes Abaqus or Nastran type names, as in
+    ``write_abaqus``. Every element gets property ID ``pid``.
+    """
+    if precision > 10:
+        raise ValueError(f"precision must be at most 10 to fit a 16-character large field, got {precision}")
+    blocks = _element_blocks(elements)
+    _check_nastran_ids('node', nodes.ids)
+    for _, element_ids, connectivity in blocks:
+        _check_nastran_ids('element', element_ids)
+        _check_nastran_ids('node', connectivity)
+    # '#' keeps the decimal point: Nastran reads '-50' or '0' as an integer and rejects it in X1/X2/X3
+    grid_format = f'GRID*,%d,,%#.{precision}g,%#.{precision}g\n*,%#.{precision}g\n'
+    with open(path, 'w') as f:
+        write_blocks(f, grid_format, [nodes.ids, nodes.x, nodes.y, nodes.z])
+        for element_type, element_ids, connectivity in blocks:
+            card = ABAQUS_TO_NASTRAN.get(element_type, element_type)
+            pids = np.full(len(element_ids), pid, dtype=np.int64)
+            # A free-field line holds the card name plus 8 fields; the rest goes on a ',' continuation
+            first = min(6, connectivity.shape[1])
+            element_format = card + ',%d,%d' + ',%d' * first
+            if connectivity.shape[1] > first:
+                element_format += '\n' + ',%d' * (connectivity.shape[1] - first)
+            write_blocks(f, element_format + '\n', [element_ids, pids, *connectivity.T])
+
+
+def _parse_numbers(lines, dtype):
+    text = ' '.join(lines).replace(',', ' ')
+    return np.array(text.split(), dtype=dtype)
+
+
+def read_abaqus(path, dtype=np.float64):
+    """
+    Read the *NODE and *ELEMENT blocks of an Abaqus input file.
+
+    Every block is collected as text and converted in one call, so data lines
+    wrapped with a trailing comma are handled as well.
+
+    Returns:
+    --------
+    nodes : NodeTable
+        All nodes of all *NODE blocks
+    elements : dict
+        ``{element_type: (element_ids, connectivity)}``
+    """
+    node_lines = []
+    element_lines = {}
+    current = None
+    with open(path, 'r') as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped or stripped.startswith('**'):
+                continue
+            if stripped.startswith('*'):
+                keyword, *options = [part.strip() for part in stripped.split(',')]
+                keyword = keyword.upper()
+                if keyword == '*NODE':
+                    current = node_lines
+                elif keyword == '*ELEMENT':
+                    option_map = dict(option.split('=', 1) for option in options if '=' in option)
+                    element_type = {k.strip().upper(): v.strip().upper() for k, v in option_map.items()}.get('TYPE')
+                    current = element_lines.setdefault(element_type, [])
+                else:
+                    current = None
+                continue
+            if current is not None:
+                current.append(stripped)
+
+    node_values = _parse_numbers(node_lines, float).reshape(-1, 4)
+    nodes = NodeTable.from_arrays(node_values[:, 0].astype(np.int64), node_values[:, 1:], dtype=dtype)
+
+    elements = {}
+    for element_type, lines in element_lines.items():
+        width = NODES_PER_ELEMENT.get(element_type)
+        values = _parse_numbers(lines, np.int64)
+        if width is None:
+            # Unknown type: assume one element per line
+            width = len(lines[0].rstrip(',').split(',')) - 1
+        values = values.reshape(-1, width + 1)
+        elements[element_type] = (values[:, 0], values[:, 1:])
+    return nodes, elements
+
+
+def _card_table(lines):
+    """Split card lines with the same number of fields into a 2-D array of field strings."""
+    counts = {line.count(',') for line in lines}
+    if len(counts) == 1:
+        return np.array(','.join(lines).split(','), dtype=object).reshape(len(lines), -1)
+    width = max(counts) + 1
+    return np.array([(line + ',' * (width - 1 - line.count(','))).split(',') for line in lines], dtype=object)
+
+
+def read_nastran(path, dtype=np.float64):
+    """
+    Read free-field GRID/GRID* and CHEXA/CPENTA/CTETRA cards written by ``write_nastran``.
+
+    Continuation lines are merged into their parent card first, then every card
+    type is split and converted column-wise in one pass.
+
+    Returns the nodes and ``{abaqus_type: (element_ids, connectivity)}`` like
+    ``read_abaqus``, so meshes written in either format can be diffed.
+    """
+    cards = {}
+    with open(path, 'r') as f:
+        text = f.read()
+    # Continuation lines start with ',' or with a '+' or '*' (large field) marker
+    # field; the parent's trailing continuation field is dropped when the lines are joined
+    text = re.sub(r',?(,[+*][^,\n]*)?[ \t]*\r?\n[ \t]*([+*][^,\n]*)?,', ',', text)
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('$'):
+            continue
+        name, _, fields = line.partition(',')
+        cards.setdefault(name.strip().upper().rstrip('*'), []).append(fields)
+
+    grids = _card_table(cards.get('GRID', []))
+    if len(grids):
+        ids = grids[:, 0].astype(np.int64)
+        coordinates = grids[:, 2:5].astype(float)
+    else:
+        ids, coordinates = np.empty(0, dtype=np.int64), np.empty((0, 3))
+    nodes = NodeTable.from_arrays(ids, coordinates, dtype=dtype)
+
+    elements = {}
+    for card_name, element_type in NASTRAN_TO_ABAQUS.items():
+        if card_name not in cards:
+            continue
+        width = NODES_PER_ELEMENT[element_type]
+        values = _card_table(cards[card_name])[:, :width + 2].astype(np.int64)
+        elements[element_type] = (values[:, 0], values[:, 2:])
+    return nodes, elements
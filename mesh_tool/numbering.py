@@ -0,0 +1,146 @@
+import numpy as np
+
+from mesh_tool.node_table import NodeTable
+
+
+class NodeIdCodec:
+    """
+    Integer codec for node IDs of the form ``<prefix><layer><theta><radial>``.
+
+    With the default widths this is the ``10GGTTTFF`` scheme: prefix 10, two
+    layer digits, three theta digits and two radial digits. Encoding and
+    decoding are plain integer arithmetic on int64 arrays.
+
+    Parameters:
+    -----------
+    prefix : int, optional
+        Leading digits of every ID (default: 10)
+    layer_digits, theta_digits, radial_digits : int, optional
+        Number of decimal digits of each field (default: 2, 3, 2)
+    """
+
+    def __init__(self, prefix=10, layer_digits=2, theta_digits=3, radial_digits=2):
+        self.prefix = int(prefix)
+        self.layer_digits = int(layer_digits)
+        self.theta_digits = int(theta_digits)
+        self.radial_digits = int(radial_digits)
+        if self.prefix < 1 or min(self.layer_digits, self.theta_digits, self.radial_digits) < 1:
+            raise ValueError("prefix and all digit widths must be positive")
+
+        self.radial_base = 10 ** self.radial_digits
+        self.theta_base = 10 ** self.theta_digits
+        self.layer_base = 10 ** self.layer_digits
+        self.prefix_scale = self.layer_base * self.theta_base * self.radial_base
+        if (self.prefix + 1) * self.prefix_scale > np.iinfo(np.int64).max:
+            raise ValueError(f"{self!r} does not fit in int64")
+
+    def __repr__(self):
+        return (f"NodeIdCodec(prefix={self.prefix}, layer_digits={self.layer_digits}, "
+                f"theta_digits={self.theta_digits}, radial_digits={self.radial_digits})")
+
+    @classmethod
+    def fitting(cls, max_layer, max_theta, max_radial, prefix=10):
+        """
+        Return a codec wide enough for the given largest field values.
+
+        The default ``10GGTTTFF`` widths are kept whenever they are sufficient,
+        so existing IDs do not change on meshes that already fit.
+        """
+        def width(value, default):
+            return max(default, len(str(int(value))))
+        return cls(prefix, width(max_layer, 2), width(max_theta, 3), width(max_radial, 2))
+
+    def encode(self, layer, theta, radial):
+        """
+        Encode field values into int64 IDs.
+
+        The fields are written as they appear in the ID (``10GGTTTFF`` uses
+        1-based layer and theta and radial 0 for the original node). Raises
+        ``ValueError`` if a value does not fit its digit width.
+        """
+        layer, theta, radial = np.broadcast_arrays(
+            np.asarray(layer, dtype=np.int64),
+            np.asarray(theta, dtype=np.int64),
+            np.asarray(radial, dtype=np.int64),
+        )
+        for name, values, base in (('layer', layer, self.layer_base),
+                                   ('theta', theta, self.theta_base),
+                                   ('radial', radial, self.radial_base)):
+            if values.size and (values.min() < 0 or values.max() >= base):
+                raise ValueError(f"{name} values must be in [0, {base - 1}] for {self!r}")
+        return ((self.prefix * self.layer_base + layer) * self.theta_base + theta) * self.radial_base + radial
+
+    def decode(self, ids):
+        """Decode int64 IDs back into (layer, theta, radial) arrays."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if ids.size and np.any(ids // self.prefix_scale != self.prefix):
+            raise ValueError(f"IDs do not start with prefix {self.prefix} for {self!r}")
+        radial = ids % self.radial_base
+        theta = ids // self.radial_base % self.theta_base
+        layer = ids // (self.radial_base * self.theta_base) % self.layer_base
+        return layer, theta, radial
+
+
+def layer_and_theta_index(layer_offsets):
+    """Return the 0-based (layer, theta) index of every node given the layer offsets."""
+    layer_offsets = np.asarray(layer_offsets, dtype=np.int64)
+    counts = np.diff(layer_offsets)
+    layer_index = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+    theta_index = np.arange(layer_offsets[-1], dtype=np.int64) - layer_offsets[layer_index]
+    return layer_index, theta_index
+
+
+def assign_node_ids(cylindrical_nodes, layer_offsets, fractions, frame, codec=None, dtype=np.float64):
+    """
+    Vectorized replacement for ``assign_ids_to_points``.
+
+    Every node gets the ID ``10GGTTT00`` and every fraction ring the ID
+    ``10GGTTTFF`` (1-based layer G, theta position T and fraction F). The ring
+    coordinates are the node with its radius scaled by the fraction, built for
+    all nodes and fractions in one broadcast.
+
+    Parameters:
+    -----------
+    cylindrical_nodes : array_like
+        (n, 3) nodes as (theta, r, z), sorted by layer and by theta inside a layer
+    layer_offsets : array_like
+        (layers + 1,) start offset of every layer in ``cylindrical_nodes``
+    fractions : sequence of float
+        Radius scale of every ring
+    frame : CylindricalFrame
+        Frame the cylindrical coordinates are expressed in
+    codec : NodeIdCodec, optional
+        ID codec; by default the ``10GGTTTFF`` widths, widened only when the
+        mesh has more layers, theta positions or rings than they can hold
+    dtype : np.dtype, optional
+        Coordinate precision of the table, float64 or float32 (default: float64)
+
+    Returns:
+    --------
+    NodeTable
+        n * (f + 1) nodes in global Cartesian coordinates, node by node with
+        its rings following it
+    """
+    cylindrical_nodes = np.asarray(cylindrical_nodes, dtype=float)
+    fractions = np.asarray(fractions, dtype=float)
+    n = len(cylindrical_nodes)
+    f = len(fractions)
+
+    layer_index, theta_index = layer_and_theta_index(layer_offsets)
+    if len(layer_index) != n:
+        raise ValueError(f"layer_offsets describe {len(layer_index)} nodes, got {n}")
+    if codec is None:
+        max_theta = theta_index.max() + 1 if n else 0
+        codec = NodeIdCodec.fitting(len(layer_offsets) - 1, max_theta, f)
+
+    radial = np.arange(f + 1, dtype=np.int64)
+    table = NodeTable.empty(n * (f + 1), dtype)
+    table.ids[:] = codec.encode((layer_index + 1)[:, None], (theta_index + 1)[:, None], radial).ravel()
+
+    # Column 0 keeps the original radius, the other columns are the fraction rings
+    scales = np.concatenate(([1.0], fractions))
+    rings = np.repeat(cylindrical_nodes[:, None, :], f + 1, axis=1)
+    rings[:, :, 1] *= scales
+    frame.from_cylindrical(rings.reshape(-1, 3), out=table.coordinates)
+
+    return table
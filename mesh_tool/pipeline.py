@@ -0,0 +1,75 @@
+import numpy as np
+
+from mesh_tool.cache import hash_inputs
+from mesh_tool.connectivity import hex8_connectivity
+from mesh_tool.frame import get_frame
+from mesh_tool.grouping import sort_into_layers
+from mesh_tool.merge import merge_coincident_nodes
+from mesh_tool.numbering import assign_node_ids
+
+
+def _build_ring_mesh(points, point1, point2, fractions, tolerance, dtype, merge_tolerance):
+    frame = get_frame(point2, point1)
+    cylindrical_points = frame.to_cylindrical(points)
+    order, layer_offsets = sort_into_layers(cylindrical_points, tolerance)
+
+    counts = np.diff(layer_offsets)
+    if len(counts) and np.any(counts != counts[0]):
+        raise ValueError(f"every layer needs the same number of theta positions, got {sorted(set(counts.tolist()))}")
+
+    nodes = assign_node_ids(cylindrical_points[order], layer_offsets, fractions, frame, dtype=dtype)
+    ntheta = int(counts[0]) if len(counts) else 0
+    connectivity = hex8_connectivity(len(counts), ntheta, len(fractions) + 1, nodes,
+                                     radii=np.concatenate(([1.0], fractions)))
+    if merge_tolerance is not None:
+        nodes, _ = merge_coincident_nodes(nodes, connectivity, merge_tolerance)
+    return nodes, {'C3D8': connectivity}
+
+
+def build_ring_mesh(points, point1, point2, fractions, tolerance=0.1, dtype=np.float64, cache=None,
+                    merge_tolerance=None):
+    """
+    Full node/element generation of the scripts in one call.
+
+    Transforms ``points`` about the axis (as ``change_to_cylindrical`` in
+    Tool.py), groups them into z layers, numbers the nodes and their fraction
+    rings with ``10GGTTTFF`` IDs and builds the hex8 connectivity.
+
+    Parameters:
+    -----------
+    points : array_like
+        (n, 3) Cartesian points, the same number of theta positions on every layer
+    point1, point2 : array_like
+        Two points on the axis
+    fractions : sequence of float
+        Radius scale of every ring
+    tolerance : float, optional
+        Layer tolerance of ``sort_into_layers`` (default: 0.1)
+    dtype : np.dtype, optional
+        Coordinate precision of the node table (default: float64)
+    cache : MeshCache, optional
+        If given, the mesh is looked up by a hash of all inputs and options and
+        only generated on a miss
+    merge_tolerance : float, optional
+        If given, nodes closer than this are merged, e.g. the rings of a
+        fraction of 1 or the axis nodes of a fraction of 0
+
+    Returns:
+    --------
+    nodes : NodeTable
+    elements : dict
+        ``{'C3D8': connectivity}``
+    """
+    points = np.asarray(points, dtype=float)
+    point1 = np.asarray(point1, dtype=float)
+    point2 = np.asarray(point2, dtype=float)
+    fractions = np.asarray(fractions, dtype=float)
+
+    def build():
+        return _build_ring_mesh(points, point1, point2, fractions, tolerance, dtype, merge_tolerance)
+
+    if cache is None:
+        return build()
+    key = hash_inputs(points, point1, point2, fractions, kind='ring_mesh', tolerance=tolerance,
+                      dtype=np.dtype(dtype).str, merge_tolerance=merge_tolerance)
+    return cache.get_or_build(key, build)
@@ -0,0 +1,129 @@
+import numpy as np
+
+
+def project_onto_axis(points, line_start, line_end):
+    """
+    Perpendicular projection of points onto the line ``line_start`` -> ``line_end``.
+
+    Batched form of ``find_perpendicular_projection``: ``points`` may be a single
+    point or an array of shape (..., 3); the unit vector of the line is computed
+    once for all of them.
+    """
+    points = np.asarray(points, dtype=float)
+    line_start = np.asarray(line_start, dtype=float)
+    line_vector = np.asarray(line_end, dtype=float) - line_start
+    line_unit_vector = line_vector / np.linalg.norm(line_vector)
+    projection_length = np.dot(points - line_start, line_unit_vector)
+    return line_start + projection_length[..., None] * line_unit_vector
+
+
+def interpolate_to_axis(points, line_start, line_end, fractions):
+    """
+    Move every point towards its projection on the axis by every fraction.
+
+    Ring ``i`` is ``points + fractions[i] * (projection - points)``, so fraction 0
+    keeps the original points and fraction 1 puts them on the axis.
+
+    Parameters:
+    -----------
+    points : array_like
+        (n, 3) Cartesian points
+    line_start, line_end : array_like
+        Two points on the axis
+    fractions : sequence of float
+        Interpolation factor of every ring
+
+    Returns:
+    --------
+    np.ndarray
+        (f, n, 3) ring coordinates, one (n, 3) block per fraction
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    fractions = np.asarray(fractions, dtype=float).ravel()
+    to_axis = project_onto_axis(points, line_start, line_end) - points
+    return points + fractions[:, None, None] * to_axis
+
+
+def linear_distribution(t):
+    """Evenly spaced seeds: s(t) = t."""
+    return np.asarray(t, dtype=float)
+
+
+def geometric_distribution(t, num_points, ratio=1.2):
+    """
+    Geometric bias: every interval is ``ratio`` times the previous one.
+
+    ``ratio`` > 1 clusters the seeds at the start of the segment, < 1 at its end.
+    """
+    t = np.asarray(t, dtype=float)
+    intervals = num_points - 1
+    if ratio == 1 or intervals < 1:
+        return t
+    return (ratio ** (t * intervals) - 1) / (ratio ** intervals - 1)
+
+
+def cosine_distribution(t):
+    """Cosine clustering: seeds are packed towards both ends of the segment."""
+    t = np.asarray(t, dtype=float)
+    return 0.5 * (1 - np.cos(np.pi * t))
+
+
+def perpendicular_direction(point1, point2):
+    """Unit vector perpendicular to the line ``point1`` -> ``point2`` used for radial seeding."""
+    line_vector = np.asarray(point2, dtype=float) - np.asarray(point1, dtype=float)
+    line_vector = line_vector / np.linalg.norm(line_vector)
+    if line_vector[0] != 0 or line_vector[1] != 0:
+        perp_vector = np.array([-line_vector[1], line_vector[0], 0], dtype=float)
+    else:
+        perp_vector = np.array([0, 1, 0], dtype=float)
+    return perp_vector / np.linalg.norm(perp_vector)
+
+
+def generate_perpendicular_points_batch(points, point1, point2, num_points=5, f_r=lambda r: 0.25*r,
+                                        distribution='linear', ratio=1.2):
+    """
+    Batched ``generate_perpendicular_points`` for an (n, 3) point array.
+
+    Every point is seeded with ``num_points`` points along the direction
+    perpendicular to the axis. The seed distances run from 0 to the distance
+    between the point and ``point1``, spaced by ``distribution`` and then
+    mapped through ``f_r``.
+
+    Parameters:
+    -----------
+    points : array_like
+        (n, 3) Cartesian points
+    point1, point2 : array_like
+        Two points on the axis
+    num_points : int, optional
+        Seeds per point (default: 5)
+    f_r : callable, optional
+        Maps an array of distances to an array of distances (default: 0.25 * r)
+    distribution : str, optional
+        'linear', 'geometric' or 'cosine' spacing of the seeds (default: 'linear')
+    ratio : float, optional
+        Interval growth ratio of the 'geometric' distribution (default: 1.2)
+
+    Returns:
+    --------
+    np.ndarray
+        (n, num_points, 3) seed points
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    point1 = np.asarray(point1, dtype=float)
+
+    t = np.linspace(0, 1, num=num_points)
+    if distribution == 'linear':
+        s = linear_distribution(t)
+    elif distribution == 'geometric':
+        s = geometric_distribution(t, num_points, ratio)
+    elif distribution == 'cosine':
+        s = cosine_distribution(t)
+    else:
+        raise ValueError(f"unknown distribution {distribution!r}, expected 'linear', 'geometric' or 'cosine'")
+
+    r = np.linalg.norm(point1 - points, axis=1)
+    distances = np.asarray(f_r(r[:, None] * s), dtype=float)
+
+    perp_vector = perpendicular_direction(point1, point2)
+    return points[:, None, :] + distances[..., None] * perp_vector
@@ -0,0 +1,196 @@
+import numpy as np
+
+from mesh_tool.engine import run_chunked
+from mesh_tool.faces import CONFIG_BY_ELEMENT_TYPE, CONFIG_BY_NODE_COUNT
+
+# Per corner: the corner and its three edge neighbours, ordered so that a
+# correctly oriented element has positive corner Jacobians
+CORNER_EDGES = {
+    'hex8': [(0, 1, 3, 4), (1, 2, 0, 5), (2, 3, 1, 6), (3, 0, 2, 7),
+             (4, 7, 5, 0), (5, 4, 6, 1), (6, 5, 7, 2), (7, 6, 4, 3)],
+    'penta6': [(0, 1, 2, 3), (1, 2, 0, 4), (2, 0, 1, 5), (3, 5, 4, 0), (4, 3, 5, 1), (5, 4, 3, 2)],
+}
+EDGES = {
+    'hex8': [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)],
+    'penta6': [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)],
+}
+# Tetrahedra filling the element; exact volume for planar faces
+TETRAHEDRA = {
+    'hex8': [(0, 1, 2, 6), (0, 2, 3, 6), (0, 3, 7, 6), (0, 7, 4, 6), (0, 4, 5, 6), (0, 5, 1, 6)],
+    'penta6': [(0, 1, 2, 5), (0, 1, 5, 4), (0, 4, 5, 3)],
+}
+METRICS = ('min_jacobian', 'scaled_jacobian', 'aspect_ratio', 'skew', 'volume')
+# Direction of "bad" per metric: low Jacobians and volumes, high aspect ratio and skew
+WORST_IS_LOW = {'min_jacobian': True, 'scaled_jacobian': True, 'aspect_ratio': False, 'skew': False,
+                'volume': True}
+QUALITY_CHUNK = 1 << 16
+
+
+def _triple(a, b, c):
+    """Triple product a . (b x c) of component-wise vectors ``(x, y, z)``."""
+    return (a[0] * (b[1] * c[2] - b[2] * c[1]) + a[1] * (b[2] * c[0] - b[0] * c[2])
+            + a[2] * (b[0] * c[1] - b[1] * c[0]))
+
+
+def _length(a):
+    return np.sqrt(a[0] * a[0] + a[1] * a[1] + a[2] * a[2])
+
+
+def _unit(a):
+    length = _length(a)
+    return a / np.where(length > 0, length, 1)
+
+
+def _skew(c, config):
+    """0 for a rectangular box or a right prism, 1 for a fully sheared element."""
+    if config == 'hex8':
+        axes = [_unit((c[1] - c[0]) + (c[2] - c[3]) + (c[5] - c[4]) + (c[6] - c[7])),
+                _unit((c[3] - c[0]) + (c[2] - c[1]) + (c[7] - c[4]) + (c[6] - c[5])),
+                _unit((c[4] - c[0]) + (c[5] - c[1]) + (c[6] - c[2]) + (c[7] - c[3]))]
+        cosines = [np.abs(np.sum(axes[i] * axes[j], axis=0)) for i, j in ((0, 1), (0, 2), (1, 2))]
+        return np.maximum(np.maximum(cosines[0], cosines[1]), cosines[2])
+    # Prism: sine of the angle between the extrusion and the base normal
+    e1 = c[1] - c[0]
+    e2 = c[2] - c[0]
+    normal = _unit(np.stack([e1[1] * e2[2] - e1[2] * e2[1], e1[2] * e2[0] - e1[0] * e2[2],
+                             e1[0] * e2[1] - e1[1] * e2[0]]))
+    extrusion = _unit((c[3] + c[4] + c[5]) - (c[0] + c[1] + c[2]))
+    cosine = np.abs(np.sum(normal * extrusion, axis=0))
+    return np.sqrt(np.clip(1 - cosine**2, 0, 1))
+
+
+def _quality_kernel(coordinates, index_of, config):
+    corner_edges = CORNER_EDGES[config]
+    edges = EDGES[config]
+    tetrahedra = TETRAHEDRA[config]
+
+    def kernel(block, out_block):
+        # (k, 3, n) corner-major layout: c[i] is the (3, n) coordinate plane of
+        # corner i, so all metrics below are plain arithmetic on contiguous rows
+        c = np.ascontiguousarray(coordinates[index_of(block)].transpose(1, 2, 0))
+
+        min_jacobian = np.full(len(block), np.inf)
+        scaled = np.full(len(block), np.inf)
+        for corner, first, second, third in corner_edges:
+            a, b, d = c[first] - c[corner], c[second] - c[corner], c[third] - c[corner]
+            jacobian = _triple(a, b, d)
+            lengths = _length(a) * _length(b) * _length(d)
+            np.minimum(min_jacobian, jacobian, out=min_jacobian)
+            np.minimum(scaled, jacobian / np.where(lengths > 0, lengths, np.inf), out=scaled)
+
+        shortest = np.full(len(block), np.inf)
+        longest = np.zeros(len(block))
+        for start, end in edges:
+            edge = c[end] - c[start]
+            squared = np.sum(edge * edge, axis=0)
+            np.minimum(shortest, squared, out=shortest)
+            np.maximum(longest, squared, out=longest)
+        aspect = np.sqrt(np.divide(longest, shortest, out=np.full(len(block), np.inf), where=shortest > 0))
+
+        volume = np.zeros(len(block))
+        for p, q, r, t in tetrahedra:
+            volume += _triple(c[q] - c[p], c[r] - c[p], c[t] - c[p])
+
+        out_block[:, 0] = min_jacobian
+        out_block[:, 1] = scaled
+        out_block[:, 2] = aspect
+        out_block[:, 3] = _skew(c, config)
+        out_block[:, 4] = volume / 6
+    return kernel
+
+
+def element_quality(nodes, elements, chunk_size=QUALITY_CHUNK, workers=None):
+    """
+    Per-element quality metrics of hex8 and penta6 elements.
+
+    Element coordinates are gathered block by block into corner-major
+    (k, 3, chunk) arrays and every metric is computed for the whole block at
+    once; blocks run on the thread pool of ``run_chunked``.
+
+    Parameters:
+    -----------
+    nodes : NodeTable
+        Nodes referenced by the elements
+    elements : array_like or dict
+        (n_elem, 8) or (n_elem, 6) connectivity of node IDs, or
+        ``{element_type: connectivity or (element_ids, connectivity)}``
+    chunk_size : int, optional
+        Elements per block
+    workers : int, optional
+        Number of threads (default: CPU count)
+
+    Returns:
+    --------
+    dict
+        ``element_ids`` plus one (n_elem,) array per metric:
+        ``min_jacobian`` (smallest corner Jacobian determinant),
+        ``scaled_jacobian`` (smallest corner Jacobian divided by its three edge
+        lengths; 1 for a box, <= 0 for an inverted corner), ``aspect_ratio``
+        (longest over shortest edge), ``skew`` (0 perfect, 1 degenerate) and
+        the signed ``volume``
+    """
+    if not isinstance(elements, dict):
+        elements = {CONFIG_BY_NODE_COUNT.get(np.shape(elements)[1]): elements}
+    ids = []
+    values = []
+    next_id = 1
+    for element_type, value in elements.items():
+        element_ids, connectivity = value if isinstance(value, tuple) else (None, value)
+        connectivity = np.asarray(connectivity, dtype=np.int64)
+        config = CONFIG_BY_ELEMENT_TYPE.get(str(element_type).upper(), element_type)
+        if config not in CORNER_EDGES:
+            raise ValueError(f"no quality metrics for {element_type} elements")
+        if element_ids is None:
+            element_ids = np.arange(next_id, next_id + len(connectivity), dtype=np.int64)
+        element_ids = np.asarray(element_ids, dtype=np.int64)
+        if len(element_ids):
+            next_id = int(element_ids.max()) + 1
+        out = np.empty((len(connectivity), len(METRICS)))
+        # Build the ID index once here, not concurrently in the worker threads
+        nodes.index_of(connectivity[:1])
+        run_chunked(_quality_kernel(nodes.coordinates, nodes.index_of, config), connectivity, out,
+                    chunk_size, workers)
+        ids.append(element_ids)
+        values.append(out)
+    values = np.concatenate(values) if values else np.empty((0, len(METRICS)))
+    quality = {'element_ids': np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)}
+    quality.update((name, values[:, column]) for column, name in enumerate(METRICS))
+    return quality
+
+
+def worst_elements(quality, metric='scaled_jacobian', n=10):
+    """IDs of the ``n`` worst elements by ``metric``, worst first."""
+    values = quality[metric] if WORST_IS_LOW[metric] else -quality[metric]
+    n = min(n, len(values))
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(values, n - 1)[:n]
+    return quality['element_ids'][candidates[np.argsort(values[candidates], kind='stable')]]
+
+
+def quality_summary(quality, bins=10, worst=10):
+    """
+    Histogram and worst elements of every metric in ``quality``.
+
+    Returns:
+    --------
+    dict
+        ``{metric: {'min', 'max', 'mean', 'histogram': (counts, edges), 'worst': ids}}``
+        plus ``'inverted'``, the number of elements with a scaled Jacobian <= 0
+    """
+    summary = {'inverted': int(np.count_nonzero(quality['scaled_jacobian'] <= 0))}
+    for metric in METRICS:
+        values = quality[metric]
+        finite = values[np.isfinite(values)]
+        low, high = (finite.min(), finite.max()) if len(finite) else (0.0, 1.0)
+        # Constant metrics, e.g. zero skew on a perfect ring, get a unit-wide range
+        if not high - low > 1e-9 * max(abs(low), abs(high), 1.0):
+            high = low + 1.0
+        summary[metric] = {
+            'min': float(values.min()) if len(values) else np.nan,
+            'max': float(values.max()) if len(values) else np.nan,
+            'mean': float(finite.mean()) if len(finite) else np.nan,
+            'histogram': np.histogram(finite, bins=bins, range=(low, high)),
+            'worst': worst_elements(quality, metric, worst),
+        }
+    return summary
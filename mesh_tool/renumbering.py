@@ -0,0 +1,250 @@
+import itertools
+
+import numpy as np
+
+from mesh_tool.adjacency import _blocks
+from mesh_tool.node_table import NodeTable
+from mesh_tool.quality import EDGES
+
+MORTON_BITS = 21
+
+
+def _element_edges(config, k):
+    """Node pairs linked by an element: its edges, or every pair for unknown types."""
+    if config in EDGES:
+        return EDGES[config]
+    return list(itertools.combinations(range(k), 2))
+
+
+def node_graph(nodes, elements):
+    """
+    Node adjacency graph of a mesh in CSR form over node table positions.
+
+    Two nodes are adjacent if they share an element edge (every node pair for
+    element types without an edge table).
+
+    Returns:
+    --------
+    offsets : np.ndarray
+        (len(nodes) + 1,) row offsets
+    neighbours : np.ndarray
+        Neighbour positions of node ``i`` are ``neighbours[offsets[i]:offsets[i + 1]]``, sorted
+    """
+    n = len(nodes)
+    keys = [np.empty(0, dtype=np.int64)]
+    for config, _, connectivity in _blocks(elements):
+        positions = nodes.index_of(connectivity)
+        for start, end in _element_edges(config, connectivity.shape[1]):
+            a, b = positions[:, start], positions[:, end]
+            keys.append(np.minimum(a, b) * n + np.maximum(a, b))
+    # Edges shared by neighbouring elements appear several times; a plain sort
+    # plus a mask is much faster than np.unique here
+    keys = np.sort(np.concatenate(keys))
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+    low, high = np.divmod(keys, n) if n else (keys, keys)
+    # Drop self loops of degenerate elements, then store every edge both ways
+    keep = low != high
+    low, high = low[keep], high[keep]
+    keys = np.sort(np.concatenate((low * n + high, high * n + low)))
+    rows, neighbours = np.divmod(keys, n) if n else (keys, keys)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+    return offsets, neighbours
+
+
+def _gather(offsets, neighbours, frontier):
+    """Neighbours of all ``frontier`` nodes in frontier order and the frontier rank of each."""
+    counts = offsets[frontier + 1] - offsets[frontier]
+    starts = np.repeat(offsets[frontier] - np.cumsum(counts) + counts, counts)
+    found = neighbours[starts + np.arange(counts.sum(), dtype=np.int64)]
+    return found, np.repeat(np.arange(len(frontier)), counts)
+
+
+def _cuthill_mckee_levels(offsets, neighbours, degree, start, visited):
+    """
+    Cuthill-McKee order of the component of ``start``, level by level.
+
+    A level is expanded at once: the unvisited neighbours of the frontier are
+    sorted by (parent rank, degree) and every node keeps its first occurrence,
+    which is the order the node-by-node queue of the textbook algorithm gives.
+    """
+    levels = [np.array([start], dtype=np.int64)]
+    visited[start] = True
+    while True:
+        found, parent = _gather(offsets, neighbours, levels[-1])
+        fresh = ~visited[found]
+        found, parent = found[fresh], parent[fresh]
+        if not len(found):
+            return levels
+        found = found[np.lexsort((found, degree[found], parent))]
+        unique_nodes, first = np.unique(found, return_index=True)
+        level = unique_nodes[np.argsort(first, kind='stable')]
+        visited[level] = True
+        levels.append(level)
+
+
+def _pseudo_peripheral(offsets, neighbours, degree, start, component):
+    """Start node far out on the graph: repeat BFS from the lowest-degree node of the last level."""
+    depth = -1
+    while True:
+        visited = ~component
+        levels = _cuthill_mckee_levels(offsets, neighbours, degree, start, visited)
+        if len(levels) <= depth:
+            return start
+        depth = len(levels)
+        last = levels[-1]
+        candidate = last[np.argmin(degree[last])]
+        if candidate == start:
+            return start
+        start = candidate
+
+
+def reverse_cuthill_mckee(offsets, neighbours):
+    """
+    Reverse Cuthill-McKee order of a CSR graph.
+
+    Every connected component starts at a pseudo-peripheral node; components
+    follow each other in order of their lowest-degree node.
+
+    Returns:
+    --------
+    np.ndarray
+        (n,) permutation: ``order[k]`` is the old position of the node that gets
+        new position ``k``
+    """
+    n = len(offsets) - 1
+    degree = np.diff(offsets)
+    visited = np.zeros(n, dtype=bool)
+    order = []
+    for start in np.argsort(degree, kind='stable'):
+        if visited[start]:
+            continue
+        # Mark the component first, so the peripheral search stays inside it
+        component = np.zeros(n, dtype=bool)
+        _cuthill_mckee_levels(offsets, neighbours, degree, start, component)
+        start = _pseudo_peripheral(offsets, neighbours, degree, start, component)
+        order.extend(_cuthill_mckee_levels(offsets, neighbours, degree, start, visited))
+    order = np.concatenate(order) if order else np.empty(0, dtype=np.int64)
+    return order[::-1].copy()
+
+
+def _spread_bits(values):
+    """Insert two zero bits after every bit of 21-bit integers."""
+    values = values.astype(np.uint64)
+    for shift, mask in ((32, 0x1F00000000FFFF), (16, 0x1F0000FF0000FF), (8, 0x100F00F00F00F00F),
+                        (4, 0x10C30C30C30C30C3), (2, 0x1249249249249249)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def morton_order(coordinates, bits=MORTON_BITS):
+    """
+    Space-filling-curve (Morton / Z-order) order of points.
+
+    Coordinates are quantized to ``bits`` bits per axis inside their bounding
+    box and the bits of x, y and z are interleaved into one key.
+
+    Returns:
+    --------
+    np.ndarray
+        (n,) permutation like ``reverse_cuthill_mckee``
+    """
+    if not 1 <= bits <= MORTON_BITS:
+        raise ValueError(f"bits must be between 1 and {MORTON_BITS}, got {bits}")
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 3)
+    if not len(coordinates):
+        return np.empty(0, dtype=np.int64)
+    low = coordinates.min(axis=0)
+    span = coordinates.max(axis=0) - low
+    scale = (2**bits - 1) / np.where(span > 0, span, 1)
+    cells = ((coordinates - low) * scale).astype(np.uint64)
+    keys = (_spread_bits(cells[:, 0]) | (_spread_bits(cells[:, 1]) << np.uint64(1))
+            | (_spread_bits(cells[:, 2]) << np.uint64(2)))
+    return np.argsort(keys, kind='stable')
+
+
+def bandwidth(offsets, neighbours, order=None):
+    """Largest position difference between adjacent nodes, after applying ``order`` if given."""
+    n = len(offsets) - 1
+    rank = np.arange(n, dtype=np.int64)
+    if order is not None:
+        rank[order] = np.arange(n, dtype=np.int64)
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+    if not len(rows):
+        return 0
+    return int(np.max(np.abs(rank[rows] - rank[neighbours])))
+
+
+def _as_dict(elements):
+    return elements if isinstance(elements, dict) else {None: elements}
+
+
+def renumber_mesh(nodes, elements, method='rcm', renumber_ids=True):
+    """
+    Reorder nodes and elements for a small matrix bandwidth and cache locality.
+
+    Nodes are put in ``method`` order: 'rcm' (Reverse Cuthill-McKee on the
+    node graph) or 'morton' (space-filling curve). Elements of every block are
+    then sorted by their lowest new node position.
+
+    Parameters:
+    -----------
+    nodes : NodeTable
+        Nodes of the mesh
+    elements : array_like or dict
+        Connectivity array or ``{element_type: connectivity or (element_ids, connectivity)}``
+        of node IDs
+    method : str, optional
+        'rcm' or 'morton' (default: 'rcm')
+    renumber_ids : bool, optional
+        If True, nodes and elements get new consecutive IDs from 1 in the new
+        order; if False, only the order changes and the IDs stay (default: True)
+
+    Returns:
+    --------
+    nodes : NodeTable
+        Nodes in the new order
+    elements : np.ndarray or dict
+        Like the input, rows reordered; a dict comes back as ``{type: (ids, connectivity)}``
+    node_map : np.ndarray
+        (n_nodes, 2) ``[old_id, new_id]`` rows in the old node order, so the
+        10GGTTTFF IDs can be recovered with ``NodeIdCodec.decode``
+    element_map : np.ndarray
+        (n_elem, 2) ``[old_id, new_id]`` rows in the old element order
+    """
+    if method == 'rcm':
+        order = reverse_cuthill_mckee(*node_graph(nodes, elements))
+    elif method == 'morton':
+        order = morton_order(nodes.coordinates)
+    else:
+        raise ValueError(f"unknown method {method!r}, expected 'rcm' or 'morton'")
+    rank = np.empty(len(nodes), dtype=np.int64)
+    rank[order] = np.arange(len(nodes), dtype=np.int64)
+
+    new_nodes = NodeTable(nodes.data[order])
+    if renumber_ids:
+        new_nodes.ids[:] = np.arange(1, len(nodes) + 1, dtype=np.int64)
+    node_map = np.column_stack([nodes.ids, new_nodes.ids[rank]])
+
+    new_blocks = {}
+    element_maps = []
+    next_id = 1
+    for element_type, (_, element_ids, connectivity) in zip(_as_dict(elements), _blocks(elements)):
+        node_rank = rank[nodes.index_of(connectivity)]
+        element_order = np.argsort(node_rank.min(axis=1), kind='stable')
+        new_ids = element_ids[element_order]
+        if renumber_ids:
+            new_ids = np.arange(next_id, next_id + len(element_order), dtype=np.int64)
+            next_id += len(element_order)
+        new_connectivity = new_nodes.ids[node_rank[element_order]]
+        new_blocks[element_type] = (new_ids, new_connectivity)
+        element_map = np.empty((len(element_ids), 2), dtype=np.int64)
+        element_map[:, 0] = element_ids
+        element_map[element_order, 1] = new_ids
+        element_maps.append(element_map)
+    element_map = np.concatenate(element_maps) if element_maps else np.empty((0, 2), dtype=np.int64)
+
+    if not isinstance(elements, dict):
+        return new_nodes, new_blocks[None][1], node_map, element_map
+    return new_nodes, new_blocks, node_map, element_map
+
@@ -0,0 +1,149 @@
+import itertools
+
+import numpy as np
+
+from mesh_tool.frame import get_frame
+from mesh_tool.mesh_io import write_blocks
+from mesh_tool.node_table import NodeTable
+
+DEFAULT_STREAM_CHUNK = 1 << 20
+
+
+def _parse_lines(lines, fmt, usecols, widths):
+    if fmt == 'csv':
+        return np.loadtxt(lines, delimiter=',', usecols=usecols, ndmin=2)
+    if fmt == 'whitespace':
+        return np.loadtxt(lines, usecols=usecols, ndmin=2)
+    if fmt == 'fixed':
+        if widths is None:
+            raise ValueError("fmt='fixed' needs the column widths")
+        data = np.genfromtxt(lines, delimiter=widths, usecols=usecols)
+        return data.reshape(-1, len(usecols))
+    raise ValueError(f"unknown format {fmt!r}, expected 'csv', 'whitespace' or 'fixed'")
+
+
+def read_node_chunks(path, fmt='csv', columns=(0, 1, 2, 3), widths=None, skip_header=0, comment='#',
+                     chunk_size=DEFAULT_STREAM_CHUNK, dtype=np.float64):
+    """
+    Read node records from a text file in chunks of ``chunk_size`` lines.
+
+    Parameters:
+    -----------
+    path : str or Path
+        Node file
+    fmt : str, optional
+        'csv', 'whitespace' or 'fixed' (default: 'csv')
+    columns : tuple, optional
+        Column indices of (id, x, y, z); use None for the id column if the file
+        has coordinates only, the nodes are then numbered from 1 (default: (0, 1, 2, 3))
+    widths : sequence of int, optional
+        Field widths for fmt='fixed'
+    skip_header : int, optional
+        Number of lines to skip at the start of the file (default: 0)
+    comment : str, optional
+        Lines starting with this are skipped; None keeps every line (default: '#')
+    chunk_size : int, optional
+        Maximum number of lines per chunk
+    dtype : np.dtype, optional
+        Coordinate precision of the yielded tables (default: float64)
+
+    Yields:
+    -------
+    NodeTable
+        One table per chunk
+    """
+    id_column, *xyz_columns = columns
+    usecols = tuple(xyz_columns) if id_column is None else (id_column, *xyz_columns)
+    next_id = 1
+
+    with open(path, 'r') as f:
+        lines = itertools.islice(f, skip_header, None)
+        lines = (line for line in lines if line.strip() and not (comment and line.lstrip().startswith(comment)))
+        while True:
+            block = list(itertools.islice(lines, chunk_size))
+            if not block:
+                break
+            data = _parse_lines(block, fmt, usecols, widths)
+            if id_column is None:
+                ids = np.arange(next_id, next_id + len(data), dtype=np.int64)
+                coordinates = data
+            else:
+                ids = data[:, 0].astype(np.int64)
+                coordinates = data[:, 1:]
+            next_id += len(data)
+            yield NodeTable.from_arrays(ids, coordinates, dtype=dtype)
+
+
+def cylindrical_chunks(chunks, frame):
+    """Transform every chunk to (theta, r, z) in ``frame``; the IDs are kept."""
+    for chunk in chunks:
+        out = NodeTable.empty(len(chunk), chunk.coordinates.dtype)
+        out.ids[:] = chunk.ids
+        frame.to_cylindrical(chunk.coordinates, out=out.coordinates)
+        yield out
+
+
+def ring_chunks(chunks, frame, fractions):
+    """
+    Expand every chunk into the node plus one ring node per fraction.
+
+    Ring ``k`` (1-based) of a node is the node with its radius scaled by
+    ``fractions[k - 1]`` and gets the ID ``node_id * radial_base + k``;
+    the node itself keeps ``node_id * radial_base``, where ``radial_base`` is
+    100, or a larger power of ten when there are more than 99 fractions.
+    """
+    fractions = np.asarray(fractions, dtype=float)
+    f = len(fractions)
+    radial_base = 10 ** max(2, len(str(f)))
+    scales = np.concatenate(([1.0], fractions))
+    radial = np.arange(f + 1, dtype=np.int64)
+
+    for chunk in chunks:
+        cylindrical = frame.to_cylindrical(chunk.coordinates)
+        rings = np.repeat(cylindrical[:, None, :], f + 1, axis=1)
+        rings[:, :, 1] *= scales
+
+        out = NodeTable.empty(len(chunk) * (f + 1), chunk.coordinates.dtype)
+        out.ids[:] = (chunk.ids[:, None] * radial_base + radial).ravel()
+        frame.from_cylindrical(rings.reshape(-1, 3), out=out.coordinates)
+        yield out
+
+
+def write_node_chunks(chunks, path, fmt='csv', precision=10):
+    """
+    Write node chunks to ``path`` as they arrive and return the number of nodes written.
+
+    Only one chunk is held in memory at a time.
+    """
+    delimiter = ',' if fmt == 'csv' else ' '
+    row_format = delimiter.join(['%d'] + [f'%.{precision}g'] * 3) + '\n'
+    count = 0
+    with open(path, 'w') as f:
+        for chunk in chunks:
+            write_blocks(f, row_format, [chunk.ids, chunk.x, chunk.y, chunk.z])
+            count += len(chunk)
+    return count
+
+
+def stream_transform(input_path, output_path, point1, point2, fractions=None, fmt='csv', output_fmt='csv',
+                     **read_options):
+    """
+    Read nodes, transform them and write the result chunk by chunk.
+
+    ``point1`` and ``point2`` define the axis as in ``change_to_cylindrical``
+    of Tool.py. Without ``fractions`` the nodes are written as (theta, r, z);
+    with ``fractions`` every node and its rings are written in global Cartesian
+    coordinates. Memory use is bounded by the chunk size, not by the file size.
+
+    Returns:
+    --------
+    int
+        Number of node records written
+    """
+    frame = get_frame(point2, point1)
+    chunks = read_node_chunks(input_path, fmt=fmt, **read_options)
+    if fractions is None:
+        chunks = cylindrical_chunks(chunks, frame)
+    else:
+        chunks = ring_chunks(chunks, frame, fractions)
+    return write_node_chunks(chunks, output_path, fmt=output_fmt)
@@ -0,0 +1,78 @@
+import numpy as np
+
+from mesh_tool.frame import get_frame
+
+
+def layer_grid(n_points, min_theta=8):
+    """Split about ``n_points`` into (n_layers, n_theta) with roughly twice as many theta positions as layers."""
+    n_theta = max(min_theta, int(round(np.sqrt(2 * n_points))))
+    n_layers = max(2, int(round(n_points / n_theta)))
+    return n_layers, n_theta
+
+
+def _on_axis(radius, theta, z, point1, point2):
+    """Place (theta, r, z) samples about the axis point2 -> point1, the frame of Tool.py."""
+    frame = get_frame(np.asarray(point2, dtype=float), np.asarray(point1, dtype=float))
+    return frame.from_cylindrical(np.stack([theta, radius, z], axis=-1).reshape(-1, 3))
+
+
+def cylinder_points(n_layers, n_theta, radius=50.0, pitch=1.0, point1=(0, 0, 1), point2=(0, 0, 0),
+                    jitter=0.0, shuffle=True, seed=0):
+    """
+    Points on a cylinder surface, ``n_theta`` per layer on ``n_layers`` layers.
+
+    Parameters:
+    -----------
+    n_layers, n_theta : int
+        Number of z layers and of points per layer
+    radius : float, optional
+        Cylinder radius (default: 50)
+    pitch : float, optional
+        Axial distance between layers; must stay well above the grouping
+        tolerance (default: 1)
+    point1, point2 : array_like, optional
+        Axis points as taken by ``change_to_cylindrical`` (default: the z axis)
+    jitter : float, optional
+        Uniform noise added to the axial position of every point; keep it below
+        half the grouping tolerance so the layers stay separable (default: 0)
+    shuffle : bool, optional
+        If True the points come in random order, like an unsorted node export
+    seed : int, optional
+        Random seed
+
+    Returns:
+    --------
+    np.ndarray
+        (n_layers * n_theta, 3) Cartesian points
+    """
+    rng = np.random.default_rng(seed)
+    theta = np.broadcast_to(np.linspace(-np.pi, np.pi, n_theta, endpoint=False), (n_layers, n_theta))
+    z = np.broadcast_to(pitch * np.arange(n_layers, dtype=float)[:, None], (n_layers, n_theta))
+    z = z + rng.uniform(-jitter, jitter, z.shape) if jitter else z
+    points = _on_axis(np.full(theta.shape, float(radius)), theta, z, point1, point2)
+    if shuffle:
+        points = points[rng.permutation(len(points))]
+    return points
+
+
+def crank_web_points(n_layers, n_theta, radius=60.0, throw=45.0, pitch=1.0, point1=(0.3, 0.2, 1.0),
+                     point2=(0.0, 0.0, 0.0), jitter=0.01, shuffle=True, seed=0):
+    """
+    Points on the outer contour of a crank web, stacked through its thickness.
+
+    The contour is the pear shape of a web around the main journal: the radius
+    grows from ``radius`` on the counterweight side to ``radius + throw`` on the
+    crank pin side. The axis is tilted by default, so the frame rotation is part
+    of the work, and the layers carry a small axial ``jitter``.
+
+    Parameters and return value as for ``cylinder_points``.
+    """
+    rng = np.random.default_rng(seed)
+    theta = np.broadcast_to(np.linspace(-np.pi, np.pi, n_theta, endpoint=False), (n_layers, n_theta))
+    contour = radius + throw * np.maximum(np.cos(theta), 0.0) ** 2
+    z = np.broadcast_to(pitch * np.arange(n_layers, dtype=float)[:, None], (n_layers, n_theta))
+    z = z + rng.uniform(-jitter, jitter, z.shape) if jitter else z
+    points = _on_axis(contour, theta, z, point1, point2)
+    if shuffle:
+        points = points[rng.permutation(len(points))]
+    return points
@@ -1,52 +1,47 @@
 import pandas as pd
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import re
 from pathlib import Path
 
-def read_gid_data(gid_file_path, delimiter=' ', start_line=26, column_indices=[1,2]):
+from mesh_tool.cache import ArrayCache
+from mesh_tool.gid_io import gid_cache_key, read_gid_columns, replace_excel_sheets, write_excel_sheets
+
+# Bump when the manifest layout changes, so an old manifest forces a full export
+MANIFEST_VERSION = 1
+
+def read_gid_data(gid_file_path, delimiter=' ', start_line=None, column_indices=[1,2], cache=None):
     """
     Read data from .gid file without writing to Excel.
-    """
-    skip_rows = max(0, start_line - 1)
 
-    try:
-        df = pd.read_csv(
-            gid_file_path,
-            sep='\s+',
-            engine='python',
-            skiprows=skip_rows,
-            header=None,
-            comment='!',
-            on_bad_lines='skip',
-            skip_blank_lines=True,
-        )
-    except Exception as e:
-        print(f"Warning: primary read_csv failed for {gid_file_path}: {e}")
-        df = pd.read_csv(
-            gid_file_path,
-            delimiter=delimiter,
-            engine='python',
-            skiprows=skip_rows,
-            header=None,
-            skipinitialspace=True,
-            comment='!',
-            on_bad_lines='skip',
-            skip_blank_lines=True,
-        )
-
-    if df.empty:
-        return pd.DataFrame()
-
-    # Extract specified columns
-    if df.shape[1] <= max(column_indices):
-        col_indices = [i for i in column_indices if i < df.shape[1]]
-    else:
-        col_indices = column_indices
+    The first data row is found from the header unless ``start_line`` is
+    given; only the requested columns are parsed, as float64. With an
+    ``ArrayCache`` as ``cache``, files unchanged since the last read (same
+    path, size and mtime) load from the cache without parsing.
+    """
+    data = read_gid_columns(gid_file_path, column_indices, start_line=start_line, drop_missing=True, cache=cache)
 
-    result_df = df.iloc[:, col_indices].copy()
-    result_df.columns = ['col_' + str(i) for i in range(len(col_indices))]
+    result_df = pd.DataFrame(data, columns=['col_' + str(i) for i in range(data.shape[1])], copy=False)
 
     return result_df
+
+
+def read_gid_sheet(gid_file_path, start_line=None, column_indices=[1,2]):
+    """
+    Read the sheet of one .gid file: sheet name and DataFrame (crank_angle, result).
+    """
+    gid_name = Path(gid_file_path).stem  # filename without extension
+    result_df = read_gid_data(gid_file_path, start_line=start_line, column_indices=column_indices)
+    if result_df.empty:
+        print(f"Warning: {gid_file_path} resulted in empty DataFrame after reading")
+        result_df = pd.DataFrame(columns=['crank_angle', 'result'])
+    result_df.columns = ['crank_angle', 'result'][:len(result_df.columns)]
+    return re.split(r'[-_]', gid_name)[-1], result_df
+
+
+def gid_to_excel(gid_file_path, output_excel_path=None, delimiter=' ', sheet_merge=True, start_line=None,
+                 column_indices=[1,2]):
     """
     Extract data from .gid file (start_line to end) and write to Excel.
     
@@ -61,7 +56,7 @@ def read_gid_data(gid_file_path, delimiter=' ', start_line=26, column_indices=[1
     sheet_merge : bool, optional
         If True, append to existing sheet; if False, create/overwrite (default: True)
     start_line : int, optional
-        Starting line (1-indexed) to read from GID file (default: 26)
+        Starting line (1-indexed) to read from GID file (default: detected from the header)
     
     Returns:
     --------
@@ -69,82 +64,21 @@ def read_gid_data(gid_file_path, delimiter=' ', start_line=26, column_indices=[1
         DataFrame with extracted columns (crank_angle, result)
     """
     
-    # Get file info
-    gid_path = Path(gid_file_path)
-    gid_name = gid_path.stem  # filename without extension
-    folder_name = gid_path.parent.name  # parent folder name
-    
     if output_excel_path is None:
         output_excel_path = 'output.xlsx'
     
-    output_excel_path = Path(output_excel_path)
-    
-    # Read .gid file starting from provided line
-    # skiprows is 0-indexed, so skip (start_line - 1) lines
-    skip_rows = max(0, start_line - 1)
-
-    try:
-        df = pd.read_csv(
-            gid_file_path,
-            sep='\s+',
-            engine='python',
-            skiprows=skip_rows,
-            header=None,
-            comment='!',
-            on_bad_lines='skip',
-            skip_blank_lines=True,
-        )
-    except Exception as e:
-        print(f"Warning: primary read_csv failed for {gid_file_path}: {e}")
-        print("Retrying with fallback settings")
-        df = pd.read_csv(
-            gid_file_path,
-            delimiter=delimiter,
-            engine='python',
-            skiprows=skip_rows,
-            header=None,
-            skipinitialspace=True,
-            comment='!',
-            on_bad_lines='skip',
-            skip_blank_lines=True,
-        )
-
-    print(f"Debug: {gid_file_path} - start_line {start_line}, skip_rows {skip_rows}, df.shape {df.shape}")
-    if not df.empty:
-        print(f"Debug: First 3 rows of {gid_file_path}:")
-        print(df.head(3))
-    if df.empty:
-        print(f"Warning: {gid_file_path} resulted in empty DataFrame after reading")
-        return pd.DataFrame(columns=['crank_angle', 'result'])
-    
-    # Extract specified columns
-    if df.shape[1] <= max(column_indices):
-        print(f"Warning: {gid_file_path} has only {df.shape[1]} columns, requested max index {max(column_indices)}. Using available columns.")
-        col_indices = [i for i in column_indices if i < df.shape[1]]
-    else:
-        col_indices = column_indices
-    
-    result_df = df.iloc[:, col_indices].copy()
-    result_df.columns = ['crank_angle', 'result'][:len(col_indices)]
-    
-    # Include all rows starting from line 26
+    sheet_name, result_df = read_gid_sheet(gid_file_path, start_line, column_indices)
     
     # Write to Excel
-    if sheet_merge and output_excel_path.exists():
-        # Append to existing file with new sheet
-        with pd.ExcelWriter(output_excel_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            result_df.to_excel(writer, sheet_name=re.split(r'[-_]', gid_name)[-1], index=False, header=False)
-    else:
-        # Create new Excel file
-        with pd.ExcelWriter(output_excel_path, engine='openpyxl') as writer:
-            result_df.to_excel(writer, sheet_name=re.split(r'[-_]', gid_name)[-1], index=False, header=False)
+    write_excel_sheets(output_excel_path, [(sheet_name, result_df)], append=sheet_merge, header=False)
     
-    print(f"✓ Written to {output_excel_path} | Sheet: {re.split(r'[-_]', gid_name)[-1]} | Rows: {len(result_df)}")
+    print(f"✓ Written to {output_excel_path} | Sheet: {sheet_name} | Rows: {len(result_df)}")
     
     return result_df
 
 
-def process_multiple_gid_files(directory_path, output_excel_path=None, delimiter=' ', pattern='*.gid'):
+def process_multiple_gid_files(directory_path, output_excel_path=None, delimiter=' ', pattern='*.gid',
+                               batched=True, write_only=False):
     """
     Process multiple .gid files from a directory and combine into one Excel file.
     
@@ -158,6 +92,14 @@ def process_multiple_gid_files(directory_path, output_excel_path=None, delimiter
         Delimiter in .gid files
     pattern : str, optional
         File pattern to search (default: '*.gid')
+    batched : bool, optional
+        If True, open the workbook once and write every sheet in that session;
+        if False, call gid_to_excel per file, which reloads and rewrites the
+        whole workbook for every sheet (default: True)
+    write_only : bool, optional
+        Stream rows through a write-only workbook with constant memory, for
+        sheets of hundreds of thousands of rows; the workbook is created from
+        scratch instead of appended to (default: False)
     """
     
     directory = Path(directory_path)
@@ -172,8 +114,131 @@ def process_multiple_gid_files(directory_path, output_excel_path=None, delimiter
     
     print(f"Found {len(gid_files)} .gid file(s). Processing...")
     
-    for gid_file in gid_files:
-        gid_to_excel(gid_file, output_excel_path, delimiter=delimiter, sheet_merge=True)
+    if not batched:
+        for gid_file in gid_files:
+            gid_to_excel(gid_file, output_excel_path, delimiter=delimiter, sheet_merge=True)
+        return
+    
+    # Files are parsed one at a time while the writer is open
+    sheets = (read_gid_sheet(gid_file) for gid_file in gid_files)
+    written = write_excel_sheets(output_excel_path, sheets, append=not write_only, write_only=write_only,
+                                 header=False)
+    for sheet_name, rows in written:
+        print(f"✓ Written to {output_excel_path} | Sheet: {sheet_name} | Rows: {rows}")
+
+
+def load_gid_files(jobs, workers=8, pool='thread'):
+    """
+    Read many .gid files concurrently with ``read_gid_data``.
+
+    Reading GID files from a network share is I/O-bound, so a thread pool
+    keeps several reads in flight; a process pool also spreads the parsing
+    over the CPUs.
+
+    Parameters:
+    -----------
+    jobs : list of (str, dict)
+        ``(gid_file_path, read_gid_data keyword arguments)`` per file
+    workers : int, optional
+        Number of concurrent reads; 1 reads the files one after another (default: 8)
+    pool : str, optional
+        'thread' or 'process' (default: 'thread')
+
+    Returns:
+    --------
+    list of (pd.DataFrame or None, Exception or None)
+        One ``(df, error)`` per job, in job order; a failed read does not stop the others
+    """
+    if pool not in ('thread', 'process'):
+        raise ValueError(f"pool must be 'thread' or 'process', got {pool!r}")
+    results = []
+    if workers <= 1 or len(jobs) <= 1:
+        for path, kwargs in jobs:
+            try:
+                results.append((read_gid_data(path, **kwargs), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+
+    executor = ThreadPoolExecutor if pool == 'thread' else ProcessPoolExecutor
+    with executor(max_workers=min(workers, len(jobs))) as pool_executor:
+        futures = [pool_executor.submit(read_gid_data, path, **kwargs) for path, kwargs in jobs]
+        for future in futures:
+            try:
+                results.append((future.result(), None))
+            except Exception as e:
+                results.append((None, e))
+    return results
+
+
+def combine_speeds(speed_data):
+    """
+    Combine the per-speed DataFrames of one GID file into one sheet:
+    crank_angle from the first speed, then one result_<speed> column per speed.
+    """
+    combined_df = pd.DataFrame()
+
+    # Sort speeds to ensure consistent order
+    sorted_speeds = sorted(speed_data.keys())
+
+    for idx, spd in enumerate(sorted_speeds):
+        df_spd = speed_data[spd]
+        if idx == 0:  # First speed provides crank_angle
+            if len(df_spd.columns) > 0:
+                combined_df['crank_angle'] = df_spd.iloc[:, 0]
+            if len(df_spd.columns) > 1:
+                combined_df[f'result_{spd}'] = df_spd.iloc[:, 1]
+            else:
+                combined_df[f'result_{spd}'] = df_spd.iloc[:, 0]
+        else:  # Subsequent speeds only provide result
+            if len(df_spd.columns) > 0:
+                combined_df[f'result_{spd}'] = df_spd.iloc[:, 0]
+
+    return combined_df
+
+
+def input_fingerprint(gid_file_path, start_line=None, column_indices=[1,2]):
+    """
+    Fingerprint of one sheet input: path, size, mtime and parse options; None if the file is missing.
+    """
+    try:
+        return gid_cache_key(gid_file_path, columns=[int(i) for i in column_indices], start_line=start_line,
+                             drop_missing=True)
+    except OSError:
+        return None
+
+
+def workbook_stamp(excel_path):
+    stat = os.stat(excel_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def load_manifest(manifest_path, excel_path, speed):
+    """
+    Manifest of the last export, or None if it is missing, was written for
+    other speeds, or the workbook was changed or removed since.
+    """
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != MANIFEST_VERSION or manifest.get('speeds') != list(speed):
+            return None
+        if manifest.get('workbook') != workbook_stamp(excel_path):
+            return None
+    except (OSError, ValueError):
+        return None
+    return manifest
+
+
+def save_manifest(manifest_path, excel_path, speed, sheets):
+    """
+    Record the input fingerprints of every sheet, ``{sheet_name: {'gid_file', 'inputs': {speed: fingerprint}}}``,
+    together with the state of the workbook they were written to.
+    """
+    manifest = {'version': MANIFEST_VERSION, 'speeds': list(speed), 'workbook': workbook_stamp(excel_path),
+                'sheets': sheets}
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
 
 
 # Example usage:
@@ -202,7 +267,13 @@ if __name__ == "__main__":
     speed_value = config.get('speed')
     list_gid = config.get('List_GID_file_name')
     excel_path = config.get('excel_path')
-    start_line_value = config.get('START_LINE', '26')
+    start_line_value = config.get('START_LINE')
+    workers_value = config.get('workers', '8')
+    pool = config.get('pool', 'thread')
+    cache_dir = config.get('cache_dir')
+    cache_max_mb = config.get('cache_max_mb', '2048')
+    use_cache = config.get('use_cache', 'True')
+    incremental = config.get('incremental', 'False').lower() in ('true', '1', 'yes')
 
     if not Excite_path or not case_set or not speed_value or not list_gid or not excel_path:
         print("info.f must include Excite_path, case_set, speed, List_GID_file_name, and excel_path")
@@ -226,27 +297,51 @@ if __name__ == "__main__":
         print("List_GID_file_name must be a Python list string, e.g. [\"PTOT.GID\", \"PASP.GID\"]")
         exit(1)
 
-    # Parse START_LINE as int or list
+    # Parse START_LINE as int or list; without it the data start is detected per file
     try:
-        start_line_parsed = eval(start_line_value) if isinstance(start_line_value, str) else start_line_value
-        if isinstance(start_line_parsed, list):
-            start_line = [int(x) for x in start_line_parsed]
+        if start_line_value is None:
+            start_line = None
         else:
-            start_line = int(start_line_parsed)
+            start_line_parsed = eval(start_line_value) if isinstance(start_line_value, str) else start_line_value
+            if isinstance(start_line_parsed, list):
+                start_line = [int(x) for x in start_line_parsed]
+            else:
+                start_line = int(start_line_parsed)
     except Exception:
         print("START_LINE must be an integer or a list of integers, e.g. 26 or [26, 27]")
         exit(1)
 
+    try:
+        workers = int(workers_value)
+    except ValueError:
+        print("workers must be an integer, e.g. 8")
+        exit(1)
+    if pool not in ('thread', 'process'):
+        print("pool must be thread or process")
+        exit(1)
+
+    # Parsed GID columns are cached in cache_dir; use_cache: False bypasses the cache
+    cache = None
+    if cache_dir and use_cache.lower() not in ('false', '0', 'no'):
+        try:
+            cache = ArrayCache(cache_dir, max_bytes=int(float(cache_max_mb) * 2**20))
+        except ValueError:
+            print("cache_max_mb must be a number, e.g. 2048")
+            exit(1)
+
     print(f"Excite path: {Excite_path}")
     print(f"Case set: {case_set}")
     print(f"Speeds: {speed}")
     print(f"GID files: {list_gid}")
     print(f"Excel path: {excel_path}")
-    print(f"Start line(s): {start_line}")
-
-    # Process for each speed
-    data_dict = {}  # key: gid_file, value: dict of speed to df
+    print(f"Start line(s): {start_line if start_line is not None else 'auto'}")
+    print(f"Loading with {workers} {pool} worker(s)")
+    print(f"Cache: {cache.directory if cache is not None else 'off'}")
+    print(f"Incremental: {incremental}")
 
+    # Collect every (speed, gid_file) read, in the speed order data_dict relies on
+    jobs = []
+    job_keys = []
     for spd in speed:
         folder_path = os.path.join(Excite_path, f"{case_set}.{spd}rpm", "results")
         print(f"Processing speed {spd}rpm from {folder_path}")
@@ -261,39 +356,94 @@ if __name__ == "__main__":
             else:  # Subsequent speeds only provide result
                 col_indices = [2]  # column 3
 
-            try:
-                df = read_gid_data(gid_full_path, delimiter=' ', start_line=current_start_line, column_indices=col_indices)
-                if gid_file not in data_dict:
-                    data_dict[gid_file] = {}
-                data_dict[gid_file][spd] = df
-                print(f"Loaded {gid_file} for {spd}rpm: {len(df)} rows")
-            except Exception as e:
-                print(f"Error processing {gid_full_path}: {e}")
+            jobs.append((gid_full_path, {'delimiter': ' ', 'start_line': current_start_line,
+                                         'column_indices': col_indices, 'cache': cache}))
+            job_keys.append((spd, gid_file))
+
+    sheet_names = [re.split(r'[-_]', Path(gid_file).stem)[-1] for _, gid_file in job_keys]
+    fingerprints = [input_fingerprint(path, kwargs['start_line'], kwargs['column_indices']) for path, kwargs in jobs]
+
+    # Incremental mode: compare the inputs with the manifest of the last export
+    # and reload only the (speed, gid_file) reads whose fingerprint changed
+    manifest_path = f"{excel_path}.manifest.json"
+    manifest = load_manifest(manifest_path, excel_path, speed) if incremental else None
+    if manifest is not None and set(manifest['sheets']) - set(sheet_names):
+        manifest = None  # a sheet was dropped from List_GID_file_name: rebuild the workbook
+    to_load = list(range(len(jobs)))
+    affected = []
+    existing = {}
+    if manifest is not None:
+        recorded = [manifest['sheets'].get(sheet_names[k], {}).get('inputs', {}) for k in range(len(jobs))]
+        changed = {k for k, (spd, _) in enumerate(job_keys)
+                   if str(spd) not in recorded[k] or recorded[k][str(spd)] != fingerprints[k]}
+        affected = sorted({sheet_names[k] for k in changed})
+        print(f"{len(changed)} of {len(jobs)} file(s) changed, {len(affected)} sheet(s) to update")
+        if not changed:
+            print("Processing complete.")
+            exit(0)
+        with pd.ExcelFile(excel_path, engine='openpyxl') as workbook:
+            present = [name for name in affected if name in workbook.sheet_names]
+            existing = workbook.parse(present) if present else {}
+        # Unchanged speeds of affected sheets come from the existing sheet; the
+        # first speed must be the lowest, or its result column was not kept
+        to_load = []
+        for k, (spd, gid_file) in enumerate(job_keys):
+            if sheet_names[k] not in affected:
                 continue
+            if sheet_names[k] not in existing:
+                to_load.append(k)
+                continue
+            columns = ['crank_angle', f'result_{spd}'] if spd == speed[0] else [f'result_{spd}']
+            if k in changed or speed[0] != min(speed) or not set(columns) <= set(existing[sheet_names[k]].columns):
+                to_load.append(k)
+
+    # Load concurrently; results come back in job order
+    data_dict = {}  # key: gid_file, value: dict of speed to df
+    failures = []
+    loaded = load_gid_files([jobs[k] for k in to_load], workers, pool)
+    for k, (df, error) in zip(to_load, loaded):
+        (spd, gid_file), (path, _) = job_keys[k], jobs[k]
+        if error is not None:
+            print(f"Error processing {path}: {error}")
+            failures.append(path)
+            fingerprints[k] = None
+            continue
+        if gid_file not in data_dict:
+            data_dict[gid_file] = {}
+        data_dict[gid_file][spd] = df
+        print(f"Loaded {gid_file} for {spd}rpm: {len(df)} rows")
+
+    if failures:
+        print(f"{len(failures)} of {len(to_load)} file(s) failed to load:")
+        for path in failures:
+            print(f"  {path}")
+
+    # Fill the affected sheets up with the reused speeds, in job (speed) order
+    reloaded = set(to_load)
+    for k, (spd, gid_file) in enumerate(job_keys):
+        if sheet_names[k] not in existing or k in reloaded:
+            continue
+        if fingerprints[k] is None:
+            continue  # missing in the last export as well
+        columns = ['crank_angle', f'result_{spd}'] if spd == speed[0] else [f'result_{spd}']
+        data_dict.setdefault(gid_file, {})[spd] = existing[sheet_names[k]][columns]
 
     # Now write to Excel
-    with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-        for gid_file, speed_data in data_dict.items():
-            sheet_name = re.split(r'[-_]', Path(gid_file).stem)[-1]
-            combined_df = pd.DataFrame()
-
-            # Sort speeds to ensure consistent order
-            sorted_speeds = sorted(speed_data.keys())
-
-            for idx, spd in enumerate(sorted_speeds):
-                df_spd = speed_data[spd]
-                if idx == 0:  # First speed provides crank_angle
-                    if len(df_spd.columns) > 0:
-                        combined_df['crank_angle'] = df_spd.iloc[:, 0]
-                    if len(df_spd.columns) > 1:
-                        combined_df[f'result_{spd}'] = df_spd.iloc[:, 1]
-                    else:
-                        combined_df[f'result_{spd}'] = df_spd.iloc[:, 0]
-                else:  # Subsequent speeds only provide result
-                    if len(df_spd.columns) > 0:
-                        combined_df[f'result_{spd}'] = df_spd.iloc[:, 0]
-
-            combined_df.to_excel(writer, sheet_name=sheet_name, index=False)
-            print(f"Written {sheet_name} to {excel_path}")
+    sheets = ((re.split(r'[-_]', Path(gid_file).stem)[-1], combine_speeds(speed_data))
+              for gid_file, speed_data in data_dict.items())
+    if manifest is not None:
+        written = replace_excel_sheets(excel_path, sheets)
+    else:
+        written = write_excel_sheets(excel_path, sheets, append=False)
+    for sheet_name, _ in written:
+        print(f"Written {sheet_name} to {excel_path}")
+
+    if incremental:
+        sheet_inputs = {} if manifest is None else manifest['sheets']
+        for k, (spd, gid_file) in enumerate(job_keys):
+            if manifest is None or sheet_names[k] in affected:
+                sheet = sheet_inputs.setdefault(sheet_names[k], {'gid_file': gid_file, 'inputs': {}})
+                sheet['inputs'][str(spd)] = fingerprints[k]
+        save_manifest(manifest_path, excel_path, speed, sheet_inputs)
 
     print("Processing complete.")
\ No newline at end of file
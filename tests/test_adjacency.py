@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from mesh_tool.adjacency import FaceNeighbourIndex
+
+
+def _hexes_on_face(count):
+    """``count`` hex8 elements that all share the face 1-2-3-4 (nodes 5.. are unique)."""
+    face = [1, 2, 3, 4]
+    return np.array([face + list(range(5 + 4 * i, 9 + 4 * i)) for i in range(count)], dtype=np.int64)
+
+
+def test_manifold_face_pairs_both_ways():
+    index = FaceNeighbourIndex.build(_hexes_on_face(2))
+    assert index.neighbours[:, 0].tolist() == [1, 0]
+    assert index.neighbour_faces[:, 0].tolist() == [0, 0]
+    assert len(index.boundary_faces()[0]) == 2 * 6 - 2
+
+
+@pytest.mark.parametrize('count, expected', [(3, [1, 0, -1]), (4, [1, 0, 3, 2]), (5, [1, 0, 3, 2, -1])])
+def test_non_manifold_face_is_paired_two_by_two(count, expected):
+    index = FaceNeighbourIndex.build(_hexes_on_face(count))
+    neighbours = index.neighbours[:, 0]
+    assert neighbours.tolist() == expected
+    paired = np.flatnonzero(neighbours >= 0)
+    assert np.array_equal(neighbours[neighbours[paired]], paired)
+    element_ids, face_indices = index.boundary_faces()
+    assert element_ids[face_indices == 0].tolist() == [i + 1 for i in range(count) if expected[i] < 0]
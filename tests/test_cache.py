@@ -0,0 +1,59 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from mesh_tool import cache as cache_module
+from mesh_tool.cache import ArrayCache, MeshCache
+from mesh_tool.node_table import NodeTable
+
+
+def test_load_of_entry_evicted_during_load_is_a_miss(tmp_path, monkeypatch):
+    cache = ArrayCache(tmp_path)
+    cache.store('a', np.arange(4.0))
+
+    def evicted(path, *args, **kwargs):
+        shutil.rmtree(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(cache_module.os, 'utime', evicted)
+    assert cache.load('a') is None
+    monkeypatch.setattr(cache_module.os, 'utime', os.utime)
+    assert cache.get_or_build('a', lambda: np.arange(3.0)).tolist() == [0.0, 1.0, 2.0]
+
+
+def test_entries_skips_entries_evicted_while_listing(tmp_path, monkeypatch):
+    cache = ArrayCache(tmp_path)
+    cache.store('a', np.arange(4.0))
+    cache.store('b', np.arange(4.0))
+    stat = Path.stat
+
+    def racing_stat(path, *args, **kwargs):
+        if path.parent.name == 'a':
+            raise FileNotFoundError(path)
+        return stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, 'stat', racing_stat)
+    assert [key for key, _, _ in cache.entries()] == ['b']
+
+
+def test_array_cache_round_trip_and_eviction(tmp_path):
+    cache = ArrayCache(tmp_path, max_bytes=300)
+    assert not isinstance(cache, MeshCache)
+    built = cache.get_or_build('a', lambda: np.arange(16.0))
+    assert 'a' in cache and built.tolist() == cache.load('a').tolist()
+    cache.store('b', np.arange(16.0))
+    assert [key for key, _, _ in cache.entries()] == ['b']
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_mesh_cache_round_trip(tmp_path):
+    cache = MeshCache(tmp_path)
+    nodes = NodeTable.from_arrays(np.array([1, 2]), np.eye(3)[:2])
+    elements = {'C3D4': np.array([[1, 2, 1, 2]])}
+    cache.store('m', nodes, elements)
+    loaded_nodes, loaded_elements = cache.load('m')
+    assert np.array_equal(loaded_nodes.data, nodes.data)
+    assert loaded_elements['C3D4'].tolist() == [[1, 2, 1, 2]]
@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+
+from mesh_tool.pipeline import build_ring_mesh
+from mesh_tool.quality import element_quality, quality_summary
+from mesh_tool.synthetic import cylinder_points
+
+
+@pytest.mark.parametrize('fractions', [[0.9, 0.8, 0.7], [1.1, 1.2], [2.0, 0.3, 0.4], [0.5, 0.2, 0.1]])
+def test_ring_mesh_has_no_inverted_elements(fractions):
+    nodes, elements = build_ring_mesh(cylinder_points(4, 12), (0, 0, 1), (0, 0, 0), fractions)
+    quality = element_quality(nodes, elements)
+    assert quality_summary(quality)['inverted'] == 0
+    assert np.all(quality['volume'] > 0)
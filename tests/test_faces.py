@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from mesh_tool.adjacency import NodeElementIndex
+from mesh_tool.faces import find_faces_in_blocks, find_solid_faces
+
+# vindexList tables of get_faceid in from_Ken_kun.tcl, copied as they are
+TCL_FACES = {
+    'hex8': [[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [0, 4, 7, 3]],
+    'penta6': [[0, 1, 2], [3, 4, 5], [0, 1, 4, 3], [1, 2, 5, 4], [0, 3, 5, 2]],
+    'tetra4': [[0, 1, 2], [0, 1, 3], [1, 2, 3], [0, 3, 2]],
+}
+NODE_COUNTS = {'hex8': 8, 'penta6': 6, 'tetra4': 4}
+
+
+def check_intersection(node_list1, node_list2):
+    """Line-by-line port of the Tcl proc."""
+    len1 = len(set(node_list1)) + len(set(node_list2))
+    len2 = len(set(node_list1) | set(node_list2))
+    return abs(len1 - len2) == min(len(node_list1), len(node_list2))
+
+
+def get_faceid(node_list, config, face_node_list):
+    return [face_id for face_id, vindex_list in enumerate(TCL_FACES[config])
+            if check_intersection([node_list[vindex] for vindex in vindex_list], face_node_list)]
+
+
+def sel_solidface(element_ids, connectivity, config, face_node_ids):
+    """Element and face IDs that sel_solidface adds to the set, in its loop order."""
+    if len(face_node_ids) < 3:
+        return [], []
+    found_ids, found_faces = [], []
+    for element_id, node_list in zip(element_ids, connectivity.tolist()):
+        # *findmark only passes the elements attached to the selected nodes
+        if not set(node_list) & set(face_node_ids):
+            continue
+        for face_id in get_faceid(node_list, config, face_node_ids):
+            found_ids.append(element_id)
+            found_faces.append(face_id)
+    return found_ids, found_faces
+
+
+def _random_case(rng, config):
+    """Elements on a small node pool, so faces are shared; some are degenerate."""
+    n_elem = 30
+    pool = np.arange(101, 101 + 3 * NODE_COUNTS[config])
+    connectivity = np.array([rng.choice(pool, NODE_COUNTS[config], replace=False) for _ in range(n_elem)])
+    degenerate = rng.random(n_elem) < 0.2
+    connectivity[degenerate, 1] = connectivity[degenerate, 0]
+    element_ids = np.sort(rng.choice(np.arange(1, 1000), n_elem, replace=False))
+    return element_ids, connectivity
+
+
+def _selections(rng, connectivity, config):
+    """Exact faces, partial faces, faces plus extra nodes and random node sets."""
+    pool = np.unique(connectivity)
+    for _ in range(40):
+        element = connectivity[rng.integers(len(connectivity))]
+        face = np.unique(element[TCL_FACES[config][rng.integers(len(TCL_FACES[config]))]])
+        yield face
+        yield face[:-1]
+        yield np.unique(np.concatenate([face, rng.choice(pool, rng.integers(1, 4))]))
+        yield np.unique(rng.choice(pool, rng.integers(1, len(pool))))
+    yield pool
+
+
+@pytest.mark.parametrize('config', ['hex8', 'penta6', 'tetra4'])
+def test_find_solid_faces_matches_tcl_get_faceid(config):
+    rng = np.random.default_rng(14)
+    element_ids, connectivity = _random_case(rng, config)
+    index = NodeElementIndex.build(connectivity, element_ids)
+    n_found = 0
+    for face_node_ids in _selections(rng, connectivity, config):
+        expected_ids, expected_faces = sel_solidface(element_ids, connectivity, config, face_node_ids.tolist())
+        for options in ({}, {'index': index}):
+            ids, faces = find_solid_faces(connectivity, face_node_ids, element_ids, config, **options)
+            assert ids.tolist() == expected_ids
+            assert faces.tolist() == expected_faces
+        n_found += len(expected_ids)
+    assert n_found > 0
+
+
+def test_find_faces_in_blocks_matches_tcl_per_block():
+    rng = np.random.default_rng(41)
+    blocks = {'C3D8': _random_case(rng, 'hex8'), 'C3D6': _random_case(rng, 'penta6')}
+    blocks['C3D6'][0][:] += 1000
+    face_node_ids = np.unique(np.concatenate([blocks['C3D8'][1][0, :4], blocks['C3D6'][1][0, :3]]))
+    expected = []
+    for element_type, config in (('C3D8', 'hex8'), ('C3D6', 'penta6')):
+        expected += zip(*sel_solidface(*blocks[element_type], config, face_node_ids.tolist()))
+    ids, faces = find_faces_in_blocks(blocks, face_node_ids)
+    assert list(zip(ids.tolist(), faces.tolist())) == sorted(expected, key=lambda pair: pair[0])
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from mesh_tool.frame import CylindricalFrame, rotation_matrix
+
+
+@pytest.mark.parametrize('axis', [(0, 0, 1), (0, 0, -1), (0, 0, -3.5), (1, 2, -3), (-1, 0, 0)])
+def test_rotation_matrix_maps_axis_onto_z(axis):
+    R = rotation_matrix(axis)
+    np.testing.assert_allclose(R @ (np.array(axis) / np.linalg.norm(axis)), [0, 0, 1], atol=1e-12)
+    assert np.isclose(np.linalg.det(R), 1.0)
+
+
+def test_frame_on_negative_z_axis_points_towards_axis_point():
+    frame = CylindricalFrame((0, 0, 5), (0, 0, 2))
+    theta_r_z = frame.to_cylindrical(np.array([[0.0, 0.0, 2.0], [1.0, 0.0, 5.0]]))
+    np.testing.assert_allclose(theta_r_z[0], [0, 0, 3], atol=1e-12)
+    np.testing.assert_allclose(theta_r_z[1], [0, 1, 0], atol=1e-12)
+    points = np.array([[1.0, 2.0, 3.0], [-4.0, 0.5, 7.0]])
+    np.testing.assert_allclose(frame.from_cylindrical(frame.to_cylindrical(points)), points, atol=1e-12)
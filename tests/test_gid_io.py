@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from mesh_tool.gid_io import find_data_start, read_gid_columns
+
+GID_TEXT = """! EXCITE result
+ TITLE
+ 2
+ 12 34
+
+ deg  kN
+  1  -360.0  5.0  1
+
+  2  -359.0  6.0  2 ! comment
+  3  -358.0  7.0  3
+ END OF DATA
+"""
+
+
+@pytest.fixture
+def gid_file(tmp_path):
+    path = tmp_path / 'BigEnd1-PTOT.GID'
+    path.write_text(GID_TEXT)
+    return path
+
+
+def test_data_start_skips_numbers_in_the_header(gid_file):
+    assert find_data_start(gid_file) == (7, 4)
+
+
+@pytest.mark.parametrize('start_line', [None, 7])
+def test_read_skips_the_text_footer(gid_file, start_line):
+    data = read_gid_columns(gid_file, (1, 2), start_line=start_line)
+    np.testing.assert_array_equal(data, [[-360.0, 5.0], [-359.0, 6.0], [-358.0, 7.0]])
+
+
+@pytest.mark.parametrize('start_line', [None, 7])
+def test_missing_column_raises(gid_file, start_line):
+    with pytest.raises(ValueError, match='requested column 5'):
+        read_gid_columns(gid_file, (1, 5), start_line=start_line)
+
+
+@pytest.mark.parametrize('start_line', [None, 7])
+def test_missing_column_is_dropped_on_request(gid_file, start_line):
+    data = read_gid_columns(gid_file, (1, 5), start_line=start_line, drop_missing=True)
+    assert data.shape == (3, 1)
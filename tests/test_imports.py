@@ -0,0 +1,6 @@
+from mesh_tool.benchmark import DEFAULT_IMPORT_BUDGET, check_imports, import_times
+
+
+def test_cold_imports_stay_within_budget():
+    results = import_times()
+    assert check_imports(results, DEFAULT_IMPORT_BUDGET) == []
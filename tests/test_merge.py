@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from mesh_tool import merge
+from mesh_tool.merge import find_coincident_nodes, merge_coincident_nodes
+from mesh_tool.node_table import NodeTable
+
+
+def _brute_force_groups(coordinates, tolerance):
+    """Lowest position of every point's connected component under ``distance <= tolerance``."""
+    delta = coordinates[:, None, :] - coordinates[None, :, :]
+    close = np.einsum('ijk,ijk->ij', delta, delta) <= tolerance * tolerance
+    representative = np.arange(len(coordinates))
+    for i in range(len(coordinates)):
+        if representative[i] == i:
+            group = {i}
+            frontier = [i]
+            while frontier:
+                found = set(np.flatnonzero(close[frontier.pop()]).tolist()) - group
+                group |= found
+                frontier.extend(found)
+            representative[sorted(group)] = i
+    return representative
+
+
+def test_pairs_across_cell_boundaries_are_merged():
+    # Cells have edge 0.1: every close pair below straddles a face, edge or corner of a cell
+    coordinates = np.array([
+        [0.0999, 0.5, 0.5], [0.1001, 0.5, 0.5],
+        [-0.001, 1.0, 1.0], [0.001, 1.0, 1.0],
+        [0.2999, 0.2999, 0.2999], [0.3001, 0.3001, 0.3001],
+        [0.5, 0.5, 0.5], [0.5, 0.5, 0.61],
+        [2.0, 2.0, 2.0], [2.0, 2.0, 2.0],
+    ])
+    assert find_coincident_nodes(coordinates, 0.1).tolist() == [0, 0, 2, 2, 4, 4, 6, 7, 8, 8]
+
+
+def test_groups_are_closed_transitively():
+    coordinates = np.array([[0.0, 0, 0], [0.16, 0, 0], [0.08, 0, 0], [0.3, 0, 0]])
+    assert find_coincident_nodes(coordinates, 0.1).tolist() == [0, 0, 0, 3]
+
+
+@pytest.mark.parametrize('pair_block', [merge.PAIR_BLOCK, 7])
+def test_random_cloud_matches_brute_force(monkeypatch, pair_block):
+    monkeypatch.setattr(merge, 'PAIR_BLOCK', pair_block)
+    rng = np.random.default_rng(16)
+    coordinates = rng.uniform(-1.0, 1.0, (300, 3))
+    coordinates = np.concatenate([coordinates, coordinates[:60] + rng.normal(0, 0.03, (60, 3)), coordinates[:20]])
+    expected = _brute_force_groups(coordinates, 0.1)
+    assert np.array_equal(find_coincident_nodes(coordinates, 0.1), expected)
+
+
+def test_merge_rewrites_element_connectivity():
+    ids = np.array([10, 20, 30, 40, 50, 60])
+    coordinates = np.array([[0, 0, 0], [1, 0, 0], [0.0999, 0, 0], [1, 1, 0], [0.95, 0.02, 0], [0, 1, 0]])
+    nodes = NodeTable.from_arrays(ids, coordinates)
+    hexes = np.array([[30, 50, 40, 60, 10, 20, 40, 60]])
+    tetras = np.array([[50, 30, 60, 40]])
+    elements = {'C3D8': (np.array([1]), hexes), 'C3D4': tetras}
+
+    merged, remap = merge_coincident_nodes(nodes, elements, tolerance=0.1)
+
+    assert merged.ids.tolist() == [10, 20, 40, 60]
+    assert remap.tolist() == [10, 20, 10, 40, 20, 60]
+    assert hexes.tolist() == [[10, 20, 40, 60, 10, 20, 40, 60]]
+    assert tetras.tolist() == [[20, 10, 60, 40]]
+
+
+def test_non_positive_tolerance_raises():
+    with pytest.raises(ValueError, match='tolerance'):
+        find_coincident_nodes(np.zeros((2, 3)), 0)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from mesh_tool.mesh_io import read_nastran, write_nastran
+from mesh_tool.node_table import NodeTable
+from mesh_tool.pipeline import build_ring_mesh
+from mesh_tool.renumbering import renumber_mesh
+from mesh_tool.synthetic import cylinder_points
+
+
+def _ring_mesh():
+    return build_ring_mesh(cylinder_points(4, 12, radius=123.456789012), (0, 0, 1), (0, 0, 0), [0.9, 0.8])
+
+
+def test_write_nastran_rejects_10ggtttff_ids(tmp_path):
+    nodes, elements = _ring_mesh()
+    with pytest.raises(ValueError, match='renumber_mesh'):
+        write_nastran(tmp_path / 'mesh.bdf', nodes, elements)
+
+
+def test_write_nastran_round_trip_keeps_large_field_precision(tmp_path):
+    nodes, elements, _, _ = renumber_mesh(*_ring_mesh())
+    write_nastran(tmp_path / 'mesh.bdf', nodes, elements)
+    read_nodes, read_elements = read_nastran(tmp_path / 'mesh.bdf')
+    assert np.array_equal(read_nodes.ids, nodes.ids)
+    np.testing.assert_allclose(read_nodes.coordinates, nodes.coordinates, rtol=1e-9, atol=1e-9)
+    assert np.array_equal(read_elements['C3D8'][1], elements['C3D8'][1])
+
+
+def test_write_nastran_grid_coordinates_are_reals(tmp_path):
+    coordinates = np.array([[-50.0, -6.123233996e-15, 0.0], [1e-5, 3.0, -123.456789012]])
+    nodes = NodeTable.from_arrays(np.array([1, 2]), coordinates)
+    write_nastran(tmp_path / 'mesh.bdf', nodes, {})
+    lines = (tmp_path / 'mesh.bdf').read_text().splitlines()
+    assert lines[0] == 'GRID*,1,,-50.00000000,-6.123233996e-15'
+    assert lines[1] == '*,0.000000000'
+    fields = [field for line in lines for field in line.split(',')[1:] if field and not field.isdigit()]
+    assert len(fields) == 6
+    assert all('.' in field and len(field) <= 16 for field in fields)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from mesh_tool.numbering import NodeIdCodec
+
+
+def test_default_codec_is_10ggtttff():
+    codec = NodeIdCodec()
+    assert codec.encode(1, 1, 0) == 100100100
+    assert codec.encode(12, 345, 67) == 101234567
+    assert codec.encode(99, 999, 99) == 109999999
+
+
+def test_round_trip():
+    codec = NodeIdCodec()
+    layer, theta, radial = np.meshgrid(np.arange(0, 100, 7), np.arange(0, 1000, 37), np.arange(0, 100, 11))
+    ids = codec.encode(layer, theta, radial)
+    assert ids.dtype == np.int64
+    assert len(np.unique(ids)) == ids.size
+    for decoded, original in zip(codec.decode(ids), (layer, theta, radial)):
+        assert np.array_equal(decoded, original)
+
+
+@pytest.mark.parametrize('field, values', [('layer', (100, 1, 0)), ('theta', (1, 1000, 0)),
+                                           ('radial', (1, 1, 100)), ('radial', (1, 1, -1))])
+def test_field_overflow_raises(field, values):
+    with pytest.raises(ValueError, match=field):
+        NodeIdCodec().encode(*values)
+
+
+def test_decode_rejects_foreign_prefix():
+    with pytest.raises(ValueError, match='prefix'):
+        NodeIdCodec().decode([200100100])
+
+
+def test_fitting_keeps_default_widths_until_a_field_overflows():
+    assert repr(NodeIdCodec.fitting(99, 999, 99)) == repr(NodeIdCodec())
+    codec = NodeIdCodec.fitting(99, 1440, 99)
+    assert (codec.layer_digits, codec.theta_digits, codec.radial_digits) == (2, 4, 2)
+    ids = codec.encode(99, 1440, 5)
+    assert ids == 1099144005
+    assert [int(field) for field in codec.decode(ids)] == [99, 1440, 5]
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from mesh_tool.streaming import read_node_chunks
+
+
+def _read_ids(path, **options):
+    return np.concatenate([chunk.ids for chunk in read_node_chunks(path, fmt='whitespace', chunk_size=2,
+                                                                   **options)]).tolist()
+
+
+def test_read_node_chunks_skips_comments_and_blank_lines(tmp_path):
+    path = tmp_path / 'nodes.txt'
+    path.write_text('1 0.0 0.0 0.0\n\n  # 2 1.0 0.0 0.0\n3 2.0 0.0 0.0\n')
+    assert _read_ids(path) == [1, 3]
+
+
+@pytest.mark.parametrize('comment', [None, ''])
+def test_read_node_chunks_without_comment_filter(tmp_path, comment):
+    path = tmp_path / 'nodes.txt'
+    path.write_text('1 0.0 0.0 0.0\n\n2 1.0 0.0 0.0\n3 2.0 0.0 0.0\n')
+    assert _read_ids(path, comment=comment) == [1, 2, 3]